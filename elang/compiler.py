@@ -0,0 +1,161 @@
+
+# ============================================================
+#  Eusha Language - Expression Compiler
+#  Lowers pure expression trees into Python code objects.
+# ============================================================
+#
+#  A tree of operators over literals and names is turned into one
+#  Python lambda, so evaluating it runs as a handful of CPython
+#  bytecodes instead of one evaluator dispatch per AST node.
+#  Statements, calls and method calls stay on the tree-walker.
+
+import math
+from nodes import *
+from numba_jit import numeric_loop
+
+# Operators that map straight onto a Python operator.
+INLINE_OPS = {
+    '-': '-', '*': '*', '%': '%', '**': '**',
+    '==': '==', '!=': '!=', '<': '<', '>': '>', '<=': '<=', '>=': '>=',
+}
+
+# Operators whose Elang semantics need a runtime helper. The helpers are
+# looked up by these names in the namespace passed to compile_program.
+HELPER_OPS = {'+': 'op_add', '/': 'op_div', 'and': 'op_and', 'or': 'op_or'}
+
+
+def expression_source(node):
+    """Return Python source for a pure expression, or None if `node` holds
+    anything besides literals, names and operators. Resolved locals are
+    read from the frame list `L`, other names via `get(name)`; every
+    operand is evaluated, left to right."""
+    t = type(node)
+    if t is NumberNode or t is StringNode or t is BoolNode:
+        value = node.value
+        if isinstance(value, float) and not math.isfinite(value):
+            return None
+        text = repr(value)
+        # Keep a folded negative literal from binding looser than '**'.
+        return f'({text})' if text.startswith('-') else text
+    if t is NoneNode:
+        return 'None'
+    if t is IdentifierNode:
+        if node.slot is not None and node.depth == 0:
+            # An unassigned slot falls back to the enclosing scopes
+            return f'(v if (v := L[{node.slot}]) is not UNBOUND else get({node.name!r}))'
+        return f'get({node.name!r})'
+    if t is BinOpNode:
+        left = expression_source(node.left)
+        if left is None:
+            return None
+        right = expression_source(node.right)
+        if right is None:
+            return None
+        if node.op in INLINE_OPS or type_add(node):
+            return f'({left} {node.op} {right})'
+        if node.op in HELPER_OPS:
+            return f'{HELPER_OPS[node.op]}({left}, {right})'
+        return None
+    if t is UnaryOpNode:
+        operand = expression_source(node.operand)
+        if operand is None:
+            return None
+        if node.op == '-':
+            return f'(-{operand})'
+        if node.op == 'not':
+            return f'(not {operand})'
+        return None
+    return None
+
+
+# Operators whose result is always a number or bool (or an error)
+NUMERIC_OPS = {'-', '/', '**', '==', '!=', '<', '>', '<=', '>=', 'and', 'or'}
+
+
+def is_numeric(node):
+    """True if `node` can only evaluate to a number or bool, judging by
+    its shape alone. '*' and '%' count only over numbers, since
+    "ab" * 2 and "%s" % x give strings."""
+    t = type(node)
+    if t is NumberNode or t is BoolNode or t is UnaryOpNode:
+        return True
+    if t is BinOpNode:
+        if node.op in NUMERIC_OPS:
+            return True
+        return is_numeric(node.left) and is_numeric(node.right)
+    if t is FunctionCallNode:
+        return node.name == 'len'   # always the builtin
+    return False
+
+
+def type_add(node):
+    """Switch a '+' over two numeric operands to the TYPED_ADD opcode;
+    returns True if `node` uses it."""
+    if node.op_id != TYPED_ADD and node.op == '+' \
+            and is_numeric(node.left) and is_numeric(node.right):
+        node.op_id = TYPED_ADD
+    return node.op_id == TYPED_ADD
+
+
+def compile_expression(node, namespace):
+    """Compile a pure expression to a function `fn(env)`, or return None."""
+    source = expression_source(node)
+    if source is None:
+        return None
+    source = (
+        'def _expr(env):\n'
+        '    get = env.get\n'
+        '    L = env.locals\n'
+        f'    return {source}\n'
+    )
+    scope = {}
+    try:
+        exec(source, namespace, scope)
+    except (SyntaxError, RecursionError, MemoryError):
+        # Absurdly deep expressions overflow CPython's own parser;
+        # the tree-walker still handles them.
+        return None
+    return scope['_expr']
+
+
+def accumulation(loop):
+    """Peephole: if a range loop's body is only `s += var` or `s = s + var`,
+    return (name, slot) of the accumulator so the loop can run as one sum()."""
+    stmt = loop.body   # a one-statement body isn't wrapped in a BlockNode
+    t = type(stmt)
+    if t is CompoundAssignNode:
+        value = stmt.value
+        matches = (stmt.op == '+' and type(value) is IdentifierNode
+                   and value.name == loop.var)
+    elif t is AssignNode:
+        value = stmt.value
+        matches = (type(value) is BinOpNode and value.op == '+'
+                   and type(value.left) is IdentifierNode and value.left.name == stmt.name
+                   and type(value.right) is IdentifierNode and value.right.name == loop.var)
+    else:
+        return None
+    if not matches or stmt.name == loop.var:
+        return None
+    return (stmt.name, stmt.slot)
+
+
+def compile_program(node, namespace):
+    """Attach a compiled function to the root of every pure operator subtree.
+
+    Only BinOpNode/UnaryOpNode roots are compiled; a bare literal or name
+    is already a single dispatch in the tree-walker.
+    """
+    t = type(node)
+    if t is BinOpNode:
+        type_add(node)
+    if t is BinOpNode or t is UnaryOpNode:
+        code = compile_expression(node, namespace)
+        if code is not None:
+            node.code = code
+            return
+    elif t is ForRangeNode:
+        node.accumulate = accumulation(node)
+        if node.accumulate is None:
+            node.numeric = numeric_loop(node)
+    for child in child_nodes(node):
+        compile_program(child, namespace)
@@ -26,7 +26,7 @@ BANNER = """
 """
 
 
-def format_error(error, source_lines):
+def format_error(error, source):
     """Format a clean, professional error message with line snippet and pointer."""
     parts = []
 
@@ -48,7 +48,8 @@ def format_error(error, source_lines):
     parts.append(f'\n  {error_type} at line {line_num}:')
 
     # Show the source line with pointer
-    if source_lines and 0 < line_num <= len(source_lines):
+    source_lines = source.splitlines() if source else []
+    if 0 < line_num <= len(source_lines):
         src_line = source_lines[line_num - 1]
         parts.append(f'    {src_line}')
         if column > 0:
@@ -66,31 +67,37 @@ def format_error(error, source_lines):
     return '\n'.join(parts)
 
 
+def report_error(*lines):
+    """Print error lines to stderr, after any say() output still buffered."""
+    sys.stdout.flush()
+    for line in lines:
+        print(line, file=sys.stderr)
+
+
 def run_source(source: str, evaluator: Evaluator, filename='<stdin>') -> bool:
     """Lex → Parse → Eval a source string. Returns True on success."""
-    source_lines = source.splitlines()
-    evaluator.source_lines = source_lines
+    evaluator.source = source
 
     try:
         lexer  = Lexer(source)
         tokens = lexer.tokenize()
 
-        parser = Parser(tokens)
+        parser = Parser(tokens, source)
         ast    = parser.parse()
 
         evaluator.run(ast)
         return True
 
     except (LexerError, ParseError, RuntimeError_) as e:
-        print(format_error(e, source_lines), file=sys.stderr)
+        report_error(format_error(e, source))
     except KeyboardInterrupt:
-        print('\n  Interrupted.', file=sys.stderr)
+        report_error('\n  Interrupted.')
     except RecursionError:
-        print('\n  RuntimeError: Maximum recursion depth exceeded.', file=sys.stderr)
-        print('  Hint: Possible infinite recursion in your code.\n', file=sys.stderr)
+        report_error('\n  RuntimeError: Maximum recursion depth exceeded.',
+                     '  Hint: Possible infinite recursion in your code.\n')
     except Exception as e:
         # Suppress Python traceback — show clean message
-        print(f'\n  Internal Error: {e}\n', file=sys.stderr)
+        report_error(f'\n  Internal Error: {e}\n')
     return False
 
 
@@ -106,7 +113,7 @@ def run_file(path: str):
         source = f.read()
 
     evaluator = Evaluator(
-        source_lines=source.splitlines(),
+        source=source,
         base_path=os.path.dirname(os.path.abspath(path))
     )
     success = run_source(source, evaluator, filename=os.path.basename(path))
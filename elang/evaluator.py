@@ -5,17 +5,26 @@
 
 import sys
 import os
+import math as pymath
+import operator
+import random as pyrandom
+import nodes
 from nodes import *
+from compiler import compile_program
+from opt import fold
+from resolver import resolve
 
 
 # ---- Runtime values ----
 class EushaFunction:
-    def __init__(self, name, params, body, env, return_type=None):
+    def __init__(self, name, params, body, env, return_type=None, slots=None, num_slots=0):
         self.name        = name
         self.params      = params
         self.body        = body
         self.env         = env   # closure environment
         self.return_type = return_type
+        self.slots       = slots      # name -> frame index, from the resolver
+        self.num_slots   = num_slots
 
     def __repr__(self):
         return f'<fn {self.name}>'
@@ -23,10 +32,12 @@ class EushaFunction:
 
 class EushaLambda:
     """Lightweight expression-only lambda."""
-    def __init__(self, params, body, env):
-        self.params = params
-        self.body   = body
-        self.env    = env
+    def __init__(self, params, body, env, slots=None, num_slots=0):
+        self.params    = params
+        self.body      = body
+        self.env       = env
+        self.slots     = slots
+        self.num_slots = num_slots
 
     def __repr__(self):
         return f'<lambda ({", ".join(self.params)})>'
@@ -48,17 +59,22 @@ class EushaModule:
         return f'<module {self.name}>'
 
 
-class ReturnSignal(Exception):
-    def __init__(self, value):
-        self.value = value
+class ControlFlow:
+    """Marker a statement evaluates to when it transfers control.
 
+    break/continue/return don't raise; their marker is passed back up
+    through blocks until the enclosing loop or call consumes it.
+    """
+    def __init__(self, keyword):
+        self.keyword = keyword
 
-class BreakSignal(Exception):
-    pass
+    def __repr__(self):
+        return f'<{self.keyword}>'
 
 
-class ContinueSignal(Exception):
-    pass
+BREAK    = ControlFlow('break')
+CONTINUE = ControlFlow('continue')
+RETURN   = ControlFlow('return')   # value is left in Evaluator._return_value
 
 
 class RuntimeError_(Exception):
@@ -70,11 +86,71 @@ class RuntimeError_(Exception):
         super().__init__(f'Runtime Error: {msg}')
 
 
+# ---- Operator helpers (shared with compiled expressions) ----
+def op_add(left, right):
+    # Allow string concatenation
+    if isinstance(left, str) or isinstance(right, str):
+        return str(left) + str(right)
+    return left + right
+
+def op_div(left, right):
+    if right == 0:
+        raise RuntimeError_("Division by zero")
+    return left / right
+
+def op_and(left, right):
+    return bool(left) and bool(right)
+
+def op_or(left, right):
+    return bool(left) or bool(right)
+
+def op_not(value):
+    return not bool(value)
+
+# Indexed by the opcodes in nodes.BINARY_OPS / nodes.UNARY_OPS
+_BINOP_HANDLERS = (
+    op_add, operator.sub, operator.mul, op_div, operator.mod, operator.pow,
+    operator.eq, operator.ne, operator.lt, operator.gt, operator.le, operator.ge,
+    op_and, op_or,
+    operator.add,   # TYPED_ADD
+)
+_UNARY_HANDLERS = (operator.neg, op_not)
+
+# Empty method table for receiver types that have no methods
+_NO_METHODS = {}
+
+# Argument list of a method call without arguments
+_EMPTY = ()
+
+# How say() shows scalar values, by exact type; lists, dicts and
+# everything else go through Evaluator._format_composite
+_FORMATTERS = {
+    int:        str,
+    float:      str,
+    str:        str,
+    bool:       {True: 'true', False: 'false'}.__getitem__,
+    type(None): lambda value: 'none',
+}
+
+# Marks a frame slot whose variable has not been assigned yet.
+UNBOUND = object()
+
+# Globals visible to code produced by compiler.compile_program.
+COMPILE_NAMESPACE = {
+    'op_add': op_add, 'op_div': op_div, 'op_and': op_and, 'op_or': op_or,
+    'UNBOUND': UNBOUND,
+}
+
+
 # ---- Environment (scope) ----
 class Environment:
+    locals = None   # dict-based scopes have no frame slots
+
     def __init__(self, parent=None):
-        self.vars   = {}
-        self.parent = parent
+        self.vars    = {}
+        self.parent  = parent
+        self.globals = self if parent is None else parent.globals
+        self._version = 0   # bumped on every binding; validates call-site caches
 
     def get(self, name):
         if name in self.vars:
@@ -85,10 +161,42 @@ class Environment:
 
     def set(self, name, value):
         self.vars[name] = value
+        self._version += 1
 
     def assign(self, name, value):
         """Assign variable in the current scope (local-first)."""
         self.vars[name] = value
+        self._version += 1
+
+
+class Frame:
+    """Call scope of a function. Every name the function binds has a
+    slot assigned by the resolver (see resolver.py), so a frame is just
+    a flat list of locals plus the closure it was called from; there is
+    no per-call dict."""
+    __slots__ = ('parent', 'globals', 'slots', 'locals')
+
+    def __init__(self, parent, slots, locals_):
+        self.parent = parent
+        self.globals = parent.globals
+        self.slots  = slots
+        self.locals = locals_
+
+    def get(self, name):
+        index = self.slots.get(name)
+        if index is not None:
+            value = self.locals[index]
+            if value is not UNBOUND:
+                return value
+        return self.parent.get(name)
+
+    def set(self, name, value):
+        index = self.slots.get(name)
+        if index is None:
+            raise RuntimeError_(f"Cannot bind '{name}' in this scope")
+        self.locals[index] = value
+
+    assign = set
 
 
 # ---- Help Registry ----
@@ -164,15 +272,77 @@ HELP_REGISTRY = {
     ),
 }
 
+_SORTED_HELP_TOPICS = tuple(sorted(HELP_REGISTRY))
+
+# Output of a bare help()
+_HELP_INDEX_MSG = "\n".join(
+    ["\n  Elang Help System", "  " + "=" * 30, "  Available topics:"]
+    + [f"    - {topic}" for topic in _SORTED_HELP_TOPICS]
+    + ['\n  Usage: help("topic")\n']
+)
+
+
+# ---- Built-in modules ----
+def _math_module():
+    mod_env = Environment()
+    mod_env.set('pi',    pymath.pi)
+    mod_env.set('e',     pymath.e)
+    mod_env.set('sqrt',  lambda x: pymath.sqrt(x))
+    mod_env.set('abs',   lambda x: abs(x))
+    mod_env.set('floor', lambda x: pymath.floor(x))
+    mod_env.set('ceil',  lambda x: pymath.ceil(x))
+    mod_env.set('round', lambda x: round(x))
+    mod_env.set('pow',   lambda x, y: pymath.pow(x, y))
+    mod_env.set('sin',   lambda x: pymath.sin(x))
+    mod_env.set('cos',   lambda x: pymath.cos(x))
+    mod_env.set('tan',   lambda x: pymath.tan(x))
+    mod_env.set('log',   lambda x: pymath.log(x))
+    return EushaModule('math', mod_env)
+
+
+def _random_module():
+    mod_env = Environment()
+    mod_env.set('randint',  lambda a, b: pyrandom.randint(int(a), int(b)))
+    mod_env.set('random',   lambda: pyrandom.random())
+    mod_env.set('choice',   lambda lst: pyrandom.choice(lst))
+    mod_env.set('shuffle',  lambda lst: (pyrandom.shuffle(lst), lst)[1])
+    mod_env.set('uniform',  lambda a, b: pyrandom.uniform(a, b))
+    return EushaModule('random', mod_env)
+
+
+# Built once and shared by every `use`
+BUILTIN_MODULES = {
+    'math':   _math_module(),
+    'random': _random_module(),
+}
+
 
 # ---- Evaluator ----
 class Evaluator:
-    def __init__(self, source_lines=None, base_path=None):
+    # realpath -> (mtime, EushaModule) of evaluated file modules,
+    # shared by the main program and the modules it loads
+    _module_cache = {}
+
+    def __init__(self, source=None, base_path=None):
         self.global_env = Environment()
-        self.source_lines = source_lines or []
+        self.source = source or ''   # split into lines only to report errors
         self.base_path = base_path or os.getcwd()
+        self._dispatch = self._build_dispatch()
+        self._return_value = None
         self._setup_builtins()
 
+    def _build_dispatch(self):
+        """Map each AST node class to its (unbound) eval_* handler."""
+        dispatch = {}
+        cls = type(self)
+        for attr in dir(cls):
+            if not attr.startswith('eval_'):
+                continue
+            node_cls = getattr(nodes, attr[len('eval_'):], None)
+            if isinstance(node_cls, type) and issubclass(node_cls, Node):
+                dispatch[node_cls] = getattr(cls, attr)
+        return dispatch
+
     def _setup_builtins(self):
         """Register built-in functions into the global environment."""
         # len()
@@ -181,11 +351,11 @@ class Evaluator:
         self.global_env.set('__builtin_help__', True)
 
     def eval(self, node: Node, env: Environment):
-        method = 'eval_' + type(node).__name__
-        fn = getattr(self, method, None)
-        if fn is None:
+        try:
+            handler = self._dispatch[type(node)]
+        except KeyError:
             raise RuntimeError_(f"No evaluator for {type(node).__name__}")
-        return fn(node, env)
+        return handler(self, node, env)
 
     # ---- Literals ----
     def eval_NumberNode(self, node, env):
@@ -215,14 +385,8 @@ class Evaluator:
 
     # ---- F-Strings ----
     def eval_FStringNode(self, node, env):
-        parts = []
-        for kind, value in node.parts:
-            if kind == 'str':
-                parts.append(value)
-            elif kind == 'expr':
-                result = self.eval(value, env)
-                parts.append(self._format_value(result))
-        return ''.join(parts)
+        return node.template.format(
+            *[self._format_value(self.eval(e, env)) for e in node.exprs])
 
     def eval_IndexGetNode(self, node, env):
         target = self.eval(node.target, env)
@@ -249,97 +413,88 @@ class Evaluator:
 
     # ---- Variables ----
     def eval_IdentifierNode(self, node, env):
-        return env.get(node.name)
+        slot = node.slot
+        if slot is None:
+            return env.get(node.name)
+        depth = node.depth
+        while depth:
+            env = env.parent
+            depth -= 1
+        value = env.locals[slot]
+        if value is UNBOUND:
+            # Not assigned in this call (yet): fall back to enclosing scopes
+            return env.parent.get(node.name)
+        return value
 
     def eval_AssignNode(self, node, env):
         value = self.eval(node.value, env)
-        env.assign(node.name, value)
+        if node.slot is not None:
+            env.locals[node.slot] = value
+        else:
+            env.assign(node.name, value)
         return value
 
     # ---- Compound Assignment ----
     def eval_CompoundAssignNode(self, node, env):
-        current = env.get(node.name)
+        slot = node.slot
+        current = env.locals[slot] if slot is not None else UNBOUND
+        if current is UNBOUND:
+            current = env.get(node.name)
         right   = self.eval(node.value, env)
-        op = node.op
         try:
-            if op == '+':
-                if isinstance(current, str) or isinstance(right, str):
-                    result = str(current) + str(right)
-                else:
-                    result = current + right
-            elif op == '-': result = current - right
-            elif op == '*': result = current * right
-            elif op == '/':
-                if right == 0:
-                    raise RuntimeError_("Division by zero")
-                result = current / right
-            else:
-                raise RuntimeError_(f"Unknown compound operator '{op}'")
+            result = _BINOP_HANDLERS[node.op_id](current, right)
         except TypeError as e:
             raise RuntimeError_(str(e))
-        env.assign(node.name, result)
+        if slot is not None:
+            env.locals[slot] = result
+        else:
+            env.assign(node.name, result)
         return result
 
     # ---- Operations ----
     def eval_BinOpNode(self, node, env):
+        if node.code is not None:
+            return self._run_compiled(node.code, env)
         left  = self.eval(node.left,  env)
         right = self.eval(node.right, env)
-        op    = node.op
-
         try:
-            if op == '+':
-                # Allow string concatenation
-                if isinstance(left, str) or isinstance(right, str):
-                    return str(left) + str(right)
-                return left + right
-            if op == '-':  return left - right
-            if op == '*':  return left * right
-            if op == '/':
-                if right == 0:
-                    raise RuntimeError_("Division by zero")
-                return left / right
-            if op == '%':  return left % right
-            if op == '**': return left ** right
-            if op == '==': return left == right
-            if op == '!=': return left != right
-            if op == '<':  return left <  right
-            if op == '>':  return left >  right
-            if op == '<=': return left <= right
-            if op == '>=': return left >= right
-            if op == 'and': return bool(left) and bool(right)
-            if op == 'or':  return bool(left) or  bool(right)
+            return _BINOP_HANDLERS[node.op_id](left, right)
         except TypeError as e:
             raise RuntimeError_(str(e))
 
-        raise RuntimeError_(f"Unknown operator '{op}'")
-
     def eval_UnaryOpNode(self, node, env):
-        val = self.eval(node.operand, env)
-        if node.op == '-':   return -val
-        if node.op == 'not': return not bool(val)
-        raise RuntimeError_(f"Unknown unary op '{node.op}'")
+        if node.code is not None:
+            return self._run_compiled(node.code, env)
+        return _UNARY_HANDLERS[node.op_id](self.eval(node.operand, env))
+
+    def _run_compiled(self, code, env):
+        try:
+            return code(env)
+        except TypeError as e:
+            raise RuntimeError_(str(e))
 
     # ---- say ----
     def eval_SayNode(self, node, env):
-        value = self.eval(node.expr, env)
-        text  = self._format_value(value)
-
-        # Determine end string from modifiers
-        end = ''
-        for mod in node.modifiers:
-            if mod == 'newl':  end += '\n'
-            if mod == 'space': end += ' '
-            if mod == 'tab':   end += '\t'
-
-        print(text, end=end, flush=True)
+        if node.parts is not None:
+            # Each argument is shown as '+' would coerce it to a string
+            text = ' '.join([str(self.eval(part, env)) for part in node.parts])
+        else:
+            text = self._format_value(self.eval(node.expr, env))
+        # Buffered; elang.py flushes before reporting errors, input()
+        # flushes before prompting and the rest goes out at exit
+        write = sys.stdout.write
+        write(text)
+        write(node.end)
         return None
 
     def _format_value(self, value):
         """Format a value for display."""
-        if value is None:
-            return 'none'
-        if isinstance(value, bool):
-            return 'true' if value else 'false'
+        formatter = _FORMATTERS.get(type(value))
+        if formatter is not None:
+            return formatter(value)
+        return self._format_composite(value)
+
+    def _format_composite(self, value):
         if isinstance(value, list):
             items = ', '.join(self._format_value(v) for v in value)
             return f'[{items}]'
@@ -361,9 +516,39 @@ class Evaluator:
     # ---- method calls ----
     def eval_MethodCallNode(self, node, env):
         obj    = self.eval(node.obj, env)
-        method = node.method
-        args   = [self.eval(a, env) for a in node.args]
-
+        args   = [self.eval(a, env) for a in node.args] if node.has_args else _EMPTY
+
+        # Inline cache: same receiver type as last time -> same handler
+        if type(obj) is node._cache_type:
+            if node._cache_direct:
+                return node._cache_handler(obj)
+            return node._cache_handler(self, obj, args)
+
+        obj_type = type(obj)
+        handler = self.DIRECT_METHODS.get(obj_type, _NO_METHODS).get(node.method)
+        direct = handler is not None
+        if not direct:
+            handler = self._lookup_method(obj, node.method)
+            if handler is None:
+                return self._call_dynamic_method(obj, node.method, args)
+        node._cache_type    = obj_type
+        node._cache_handler = handler
+        node._cache_direct  = direct
+        if direct:
+            return handler(obj)
+        return handler(self, obj, args)
+
+    def _lookup_method(self, obj, method):
+        """Find the handler for a method whose target depends only on the
+        receiver's type, or None (modules, dict properties, errors)."""
+        obj_type = type(obj)
+        handler = self.METHODS.get(obj_type, _NO_METHODS).get(method)
+        if handler is None and method in self.CONVERSIONS \
+                and obj_type is not dict and obj_type is not EushaModule:
+            handler = self.CONVERSIONS[method]
+        return handler
+
+    def _call_dynamic_method(self, obj, method, args):
         # --- Module namespace access ---
         if isinstance(obj, EushaModule):
             fn = obj.get(method)
@@ -375,99 +560,138 @@ class Evaluator:
                 return fn
             raise RuntimeError_(f"'{method}' in module '{obj.name}' is not callable")
 
-        # --- Dict/Object methods ---
+        # --- Dot-access for dict properties (no parentheses) ---
         if isinstance(obj, dict):
-            if method == 'keys':
-                return list(obj.keys())
-            if method == 'values':
-                return list(obj.values())
-            if method == 'length':
-                return len(obj)
-            if method == 'has':
-                if len(args) != 1:
-                    raise RuntimeError_(".has() takes exactly 1 argument")
-                return args[0] in obj
-            # Dot-access for dict properties (no parentheses)
             if method in obj and not args:
                 return obj[method]
             raise RuntimeError_(f"Unknown object method '.{method}()'")
 
-        # --- Type conversions ---
-        try:
-            if method == 'to_int':   return int(obj)
-            if method == 'to_float': return float(obj)
-            if method == 'to_str':   return str(obj)
-        except (ValueError, TypeError) as e:
-            raise RuntimeError_(f"Cannot convert {obj!r} with .{method}(): {e}")
-
-        # --- List methods ---
         if isinstance(obj, list):
-            if method == 'push':
-                if len(args) != 1:
-                    raise RuntimeError_(".push() takes exactly 1 argument")
-                obj.append(args[0])
-                return obj
-            if method == 'pop':
-                if not obj:
-                    raise RuntimeError_("Cannot .pop() from an empty list")
-                return obj.pop()
-            if method == 'sort':
-                obj.sort()
-                return obj
-            if method == 'reverse':
-                obj.reverse()
-                return obj
-            if method == 'sum':
-                return sum(obj)
-            if method == 'max':
-                return max(obj)
-            if method == 'min':
-                return min(obj)
-            if method == 'length':
-                return len(obj)
-            if method == 'filter':
-                if len(args) != 1:
-                    raise RuntimeError_(".filter() takes exactly 1 argument (a function)")
-                fn = args[0]
-                result = []
-                for item in obj:
-                    val = self._call_function(fn, [item])
-                    if bool(val):
-                        result.append(item)
-                return result
-            if method == 'map':
-                if len(args) != 1:
-                    raise RuntimeError_(".map() takes exactly 1 argument (a function)")
-                fn = args[0]
-                return [self._call_function(fn, [item]) for item in obj]
             raise RuntimeError_(f"Unknown list method '.{method}()'")
-
-        # --- String methods ---
         if isinstance(obj, str):
-            if method == 'length':
-                return len(obj)
-            if method == 'upper':
-                return obj.upper()
-            if method == 'lower':
-                return obj.lower()
-            if method == 'trim':
-                return obj.strip()
-            if method == 'contains':
-                if len(args) != 1:
-                    raise RuntimeError_(".contains() takes exactly 1 argument")
-                return args[0] in obj
-            if method == 'split':
-                if len(args) == 0:
-                    return obj.split()
-                return obj.split(args[0])
-            if method == 'replace':
-                if len(args) != 2:
-                    raise RuntimeError_(".replace() takes exactly 2 arguments")
-                return obj.replace(args[0], args[1])
             raise RuntimeError_(f"Unknown string method '.{method}()'")
-
         raise RuntimeError_(f"Unknown method '.{method}()' on {type(obj).__name__}")
 
+    # --- Dict/Object methods ---
+    def _dict_values(self, obj, args):
+        return list(obj.values())
+
+    def _dict_has(self, obj, args):
+        if len(args) != 1:
+            raise RuntimeError_(".has() takes exactly 1 argument")
+        return args[0] in obj
+
+    # --- Type conversions ---
+    def _to_int(self, obj, args):
+        try:
+            return int(obj)
+        except (ValueError, TypeError) as e:
+            raise RuntimeError_(f"Cannot convert {obj!r} with .to_int(): {e}")
+
+    def _to_float(self, obj, args):
+        try:
+            return float(obj)
+        except (ValueError, TypeError) as e:
+            raise RuntimeError_(f"Cannot convert {obj!r} with .to_float(): {e}")
+
+    def _to_str(self, obj, args):
+        return str(obj)
+
+    # --- List methods ---
+    def _list_push(self, obj, args):
+        if len(args) != 1:
+            raise RuntimeError_(".push() takes exactly 1 argument")
+        obj.append(args[0])
+        return obj
+
+    def _list_pop(self, obj, args):
+        if not obj:
+            raise RuntimeError_("Cannot .pop() from an empty list")
+        return obj.pop()
+
+    def _list_sort(self, obj, args):
+        obj.sort()
+        return obj
+
+    def _list_reverse(self, obj, args):
+        obj.reverse()
+        return obj
+
+    def _list_filter(self, obj, args):
+        if len(args) != 1:
+            raise RuntimeError_(".filter() takes exactly 1 argument (a function)")
+        fn = args[0]
+        result = []
+        for item in obj:
+            val = self._call_function(fn, [item])
+            if bool(val):
+                result.append(item)
+        return result
+
+    def _list_map(self, obj, args):
+        if len(args) != 1:
+            raise RuntimeError_(".map() takes exactly 1 argument (a function)")
+        fn = args[0]
+        return [self._call_function(fn, [item]) for item in obj]
+
+    # --- String methods ---
+    def _str_contains(self, obj, args):
+        if len(args) != 1:
+            raise RuntimeError_(".contains() takes exactly 1 argument")
+        return args[0] in obj
+
+    def _str_split(self, obj, args):
+        if len(args) == 0:
+            return obj.split()
+        return obj.split(args[0])
+
+    def _str_replace(self, obj, args):
+        if len(args) != 2:
+            raise RuntimeError_(".replace() takes exactly 2 arguments")
+        return obj.replace(args[0], args[1])
+
+    # Per receiver type: method name -> handler(self, obj, args)
+    DICT_METHODS = {
+        'values':   _dict_values,
+        'has':      _dict_has,
+    }
+    LIST_METHODS = {
+        'push':     _list_push,
+        'pop':      _list_pop,
+        'sort':     _list_sort,
+        'reverse':  _list_reverse,
+        'filter':   _list_filter,
+        'map':      _list_map,
+    }
+    STR_METHODS = {
+        'contains': _str_contains,
+        'split':    _str_split,
+        'replace':  _str_replace,
+    }
+    METHODS = {dict: DICT_METHODS, list: LIST_METHODS, str: STR_METHODS}
+
+    # Methods that are a single builtin call on the receiver (arguments are
+    # ignored); these are called as handler(obj), with no wrapper frame
+    DIRECT_METHODS = {
+        dict: {'keys': list, 'length': len},
+        list: {'sum': sum, 'max': max, 'min': min, 'length': len},
+        str:  {'length': len, 'upper': str.upper, 'lower': str.lower, 'trim': str.strip},
+    }
+
+    # Conversions apply to any receiver except dicts and modules
+    CONVERSIONS = {
+        'to_int':   _to_int,
+        'to_float': _to_float,
+        'to_str':   _to_str,
+    }
+
+    def _new_frame(self, fn, args):
+        """Create the call frame for `fn` with params bound to `args`."""
+        # Params occupy the first slots, in order
+        locals_ = list(args)
+        locals_ += [UNBOUND] * (fn.num_slots - len(args))
+        return Frame(fn.env, fn.slots, locals_)
+
     def _call_function(self, fn, args):
         """Call an EushaFunction or EushaLambda with given arguments."""
         if isinstance(fn, EushaLambda):
@@ -475,9 +699,7 @@ class Evaluator:
                 raise RuntimeError_(
                     f"Lambda expects {len(fn.params)} args, got {len(args)}"
                 )
-            call_env = Environment(parent=fn.env)
-            for param, arg in zip(fn.params, args):
-                call_env.set(param, arg)
+            call_env = self._new_frame(fn, args)
             return self.eval(fn.body, call_env)
 
         if isinstance(fn, EushaFunction):
@@ -485,13 +707,13 @@ class Evaluator:
                 raise RuntimeError_(
                     f"'{fn.name}' expects {len(fn.params)} args, got {len(args)}"
                 )
-            call_env = Environment(parent=fn.env)
-            for param, arg in zip(fn.params, args):
-                call_env.set(param, arg)
-            try:
-                self.eval(fn.body, call_env)
-            except ReturnSignal as rs:
-                return rs.value
+            call_env = self._new_frame(fn, args)
+            flow = self.eval(fn.body, call_env)
+            if flow is RETURN:
+                value, self._return_value = self._return_value, None
+                return value
+            if flow is BREAK or flow is CONTINUE:
+                raise RuntimeError_(f"'{flow.keyword}' used outside of a loop")
             return None
 
         raise RuntimeError_(f"Value is not callable")
@@ -508,14 +730,12 @@ class Evaluator:
     # ---- while ----
     def eval_WhileNode(self, node, env):
         while bool(self.eval(node.condition, env)):
-            try:
-                self.eval(node.body, env)
-            except BreakSignal:
-                break
-            except ContinueSignal:
-                continue
-            except ReturnSignal:
-                raise
+            flow = self.eval(node.body, env)
+            if type(flow) is ControlFlow:
+                if flow is BREAK:
+                    break
+                if flow is RETURN:
+                    return RETURN
         return None
 
     # ---- for range ----
@@ -536,18 +756,51 @@ class Evaluator:
         else:
             rng = range(start, end + 1, abs(step))
 
+        if node.accumulate is not None and rng and self._sum_range(node, rng, env):
+            return None
+        if node.numeric is not None and rng and node.numeric.run(rng, env):
+            return None
+
+        var, slot, body = node.var, node.slot, node.body
+        locals_ = env.locals
         for i in rng:
-            env.set(node.var, i)
-            try:
-                self.eval(node.body, env)
-            except BreakSignal:
-                break
-            except ContinueSignal:
-                continue
-            except ReturnSignal:
-                raise
+            if slot is not None:
+                locals_[slot] = i
+            else:
+                env.set(var, i)
+            flow = self.eval(body, env)
+            if type(flow) is ControlFlow:
+                if flow is BREAK:
+                    break
+                if flow is RETURN:
+                    return RETURN
         return None
 
+    def _sum_range(self, node, rng, env):
+        """Run a loop whose body only does `s += var` (see
+        compiler.accumulation) as a single sum(). Returns False to fall
+        back to the normal loop."""
+        name, slot = node.accumulate
+        current = env.locals[slot] if slot is not None else UNBOUND
+        if current is UNBOUND:
+            try:
+                current = env.get(name)
+            except RuntimeError_:
+                return False   # let the loop report it as usual
+        # Only exact ints: float sums would round differently, strings concatenate
+        if type(current) is not int:
+            return False
+        total = current + sum(rng)
+        if slot is not None:
+            env.locals[slot] = total
+        else:
+            env.assign(name, total)
+        if node.slot is not None:
+            env.locals[node.slot] = rng[-1]
+        else:
+            env.set(node.var, rng[-1])
+        return True
+
     # ---- for each ----
     def eval_ForEachNode(self, node, env):
         iterable = self.eval(node.iterable, env)
@@ -555,30 +808,29 @@ class Evaluator:
             raise RuntimeError_(f"'{iterable}' is not iterable")
         for item in iterable:
             env.set(node.var, item)
-            try:
-                self.eval(node.body, env)
-            except BreakSignal:
-                break
-            except ContinueSignal:
-                continue
-            except ReturnSignal:
-                raise
+            flow = self.eval(node.body, env)
+            if type(flow) is ControlFlow:
+                if flow is BREAK:
+                    break
+                if flow is RETURN:
+                    return RETURN
         return None
 
     # ---- break / continue ----
     def eval_BreakNode(self, node, env):
-        raise BreakSignal()
+        return BREAK
 
     def eval_ContinueNode(self, node, env):
-        raise ContinueSignal()
+        return CONTINUE
 
     # ---- lambdas ----
     def eval_LambdaNode(self, node, env):
-        return EushaLambda(node.params, node.body, env)
+        return EushaLambda(node.params, node.body, env, node.slots, node.num_slots)
 
     # ---- functions ----
     def eval_FunctionDefNode(self, node, env):
-        fn = EushaFunction(node.name, node.params, node.body, env, node.return_type)
+        fn = EushaFunction(node.name, node.params, node.body, env, node.return_type,
+                           node.slots, node.num_slots)
         env.set(node.name, fn)
         return None
 
@@ -598,12 +850,7 @@ class Evaluator:
         # Built-in: help()
         if name == 'help':
             if len(args) == 0:
-                print("\n  Elang Help System")
-                print("  " + "=" * 30)
-                print("  Available topics:")
-                for topic in sorted(HELP_REGISTRY.keys()):
-                    print(f"    - {topic}")
-                print('\n  Usage: help("topic")\n')
+                print(_HELP_INDEX_MSG)
                 return None
             topic = str(args[0])
             if topic in HELP_REGISTRY:
@@ -614,7 +861,19 @@ class Evaluator:
             print(f"\n  No help available for '{topic}'.\n")
             return None
 
-        fn = env.get(name)
+        if node.is_global:
+            # Resolves straight to the global scope; reuse the last result
+            # while nothing has been bound there since
+            root = env.globals
+            if node._cache_env is root and node._cache_version == root._version:
+                fn = node._cache_fn
+            else:
+                fn = root.get(name)
+                node._cache_env     = root
+                node._cache_version = root._version
+                node._cache_fn      = fn
+        else:
+            fn = env.get(name)
 
         if isinstance(fn, (EushaFunction, EushaLambda)):
             return self._call_function(fn, args)
@@ -622,42 +881,16 @@ class Evaluator:
         raise RuntimeError_(f"'{name}' is not a function")
 
     def eval_ReturnNode(self, node, env):
-        value = self.eval(node.value, env)
-        raise ReturnSignal(value)
+        self._return_value = self.eval(node.value, env)
+        return RETURN
 
     # ---- modules (use) ----
     def eval_UseNode(self, node, env):
         module_name = node.module_name
 
         # Built-in modules
-        if module_name == 'math':
-            mod_env = Environment()
-            import math as pymath
-            mod_env.set('pi',    pymath.pi)
-            mod_env.set('e',     pymath.e)
-            mod_env.set('sqrt',  lambda x: pymath.sqrt(x))
-            mod_env.set('abs',   lambda x: abs(x))
-            mod_env.set('floor', lambda x: pymath.floor(x))
-            mod_env.set('ceil',  lambda x: pymath.ceil(x))
-            mod_env.set('round', lambda x: round(x))
-            mod_env.set('pow',   lambda x, y: pymath.pow(x, y))
-            mod_env.set('sin',   lambda x: pymath.sin(x))
-            mod_env.set('cos',   lambda x: pymath.cos(x))
-            mod_env.set('tan',   lambda x: pymath.tan(x))
-            mod_env.set('log',   lambda x: pymath.log(x))
-            module = EushaModule('math', mod_env)
-            env.set(module_name, module)
-            return None
-
-        if module_name == 'random':
-            mod_env = Environment()
-            import random as pyrandom
-            mod_env.set('randint',  lambda a, b: pyrandom.randint(int(a), int(b)))
-            mod_env.set('random',   lambda: pyrandom.random())
-            mod_env.set('choice',   lambda lst: pyrandom.choice(lst))
-            mod_env.set('shuffle',  lambda lst: (pyrandom.shuffle(lst), lst)[1])
-            mod_env.set('uniform',  lambda a, b: pyrandom.uniform(a, b))
-            module = EushaModule('random', mod_env)
+        module = BUILTIN_MODULES.get(module_name)
+        if module is not None:
             env.set(module_name, module)
             return None
 
@@ -669,6 +902,14 @@ class Evaluator:
         if not os.path.exists(module_path):
             raise RuntimeError_(f"Module '{module_name}' not found")
 
+        # Reuse an already-evaluated module unless the file changed since
+        abs_path = os.path.realpath(module_path)
+        mtime = os.stat(abs_path).st_mtime_ns
+        cached = self._module_cache.get(abs_path)
+        if cached is not None and cached[0] == mtime:
+            env.set(module_name, cached[1])
+            return None
+
         with open(module_path, 'r', encoding='utf-8') as f:
             source = f.read()
 
@@ -677,18 +918,19 @@ class Evaluator:
 
         lexer  = Lexer(source)
         tokens = lexer.tokenize()
-        parser = Parser(tokens)
+        parser = Parser(tokens, source)
         ast    = parser.parse()
 
         mod_env = Environment()
         mod_evaluator = Evaluator(
-            source_lines=source.splitlines(),
+            source=source,
             base_path=os.path.dirname(module_path)
         )
         mod_evaluator.global_env = mod_env
-        mod_evaluator.eval(ast, mod_env)
+        mod_evaluator.run(ast)
 
         module = EushaModule(module_name, mod_env)
+        self._module_cache[abs_path] = (mtime, module)
         env.set(module_name, module)
         return None
 
@@ -726,8 +968,18 @@ class Evaluator:
         result = None
         for stmt in node.statements:
             result = self.eval(stmt, env)
+            if type(result) is ControlFlow:
+                return result
         return result
 
     # ---- entry point ----
     def run(self, ast: BlockNode):
-        self.eval(ast, self.global_env)
+        fold(ast)
+        resolve(ast)
+        compile_program(ast, COMPILE_NAMESPACE)
+        flow = self.eval(ast, self.global_env)
+        if flow is RETURN:
+            self._return_value = None
+            raise RuntimeError_("'return' used outside of a function")
+        if type(flow) is ControlFlow:
+            raise RuntimeError_(f"'{flow.keyword}' used outside of a loop")
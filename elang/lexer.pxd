@@ -0,0 +1,15 @@
+# Cython declarations for lexer.py, used when it is compiled as an
+# extension module (see setup.py). The .py file stays the only source;
+# these types let the scanner's attribute reads and method calls
+# compile to C instead of dictionary lookups and Python calls.
+
+cdef class Lexer:
+    cdef public unicode source
+    cdef public Py_ssize_t pos
+    cdef public list tokens
+    cdef public dict fstrings
+
+    cpdef object error(self, str msg, Py_ssize_t pos, str hint)
+    cpdef tuple read_string(self, unicode quote_char)
+    cpdef Py_ssize_t closing_brace(self, Py_ssize_t pos)
+    cpdef list tokenize(self)
@@ -5,46 +5,53 @@
 # ============================================================
 
 import re
+import sys
+from typing import Any
 
 # ------ Token Types ------
-TT_INT        = 'INT'
-TT_FLOAT      = 'FLOAT'
-TT_STRING     = 'STRING'
-TT_FSTRING    = 'FSTRING'   # interpolated string parts
-TT_IDENTIFIER = 'IDENTIFIER'
-TT_KEYWORD    = 'KEYWORD'
-TT_PLUS       = 'PLUS'
-TT_MINUS      = 'MINUS'
-TT_MUL        = 'MUL'
-TT_DIV        = 'DIV'
-TT_MOD        = 'MOD'
-TT_POW        = 'POW'
-TT_EQ         = 'EQ'        # =
-TT_PLUSEQ     = 'PLUSEQ'    # +=
-TT_MINUSEQ    = 'MINUSEQ'   # -=
-TT_MULEQ      = 'MULEQ'     # *=
-TT_DIVEQ      = 'DIVEQ'     # /=
-TT_EQEQ       = 'EQEQ'     # ==
-TT_NEQ        = 'NEQ'       # !=
-TT_LT         = 'LT'        # <
-TT_GT         = 'GT'        # >
-TT_LTE        = 'LTE'       # <=
-TT_GTE        = 'GTE'       # >=
-TT_LPAREN     = 'LPAREN'    # (
-TT_RPAREN     = 'RPAREN'    # )
-TT_LBRACE     = 'LBRACE'    # {
-TT_RBRACE     = 'RBRACE'    # }
-TT_LBRACKET   = 'LBRACKET'  # [
-TT_RBRACKET   = 'RBRACKET'  # ]
-TT_COMMA      = 'COMMA'     # ,
-TT_COLON      = 'COLON'     # :
-TT_DOT        = 'DOT'       # .
-TT_DOTDOT     = 'DOTDOT'    # ..
-TT_ARROW      = 'ARROW'     # ->
-TT_FATARROW   = 'FATARROW'  # =>
-TT_CMDPREFIX  = 'CMDPREFIX'  # &&
-TT_NEWLINE    = 'NEWLINE'
-TT_EOF        = 'EOF'
+# Small ints, so the parser's type checks are int compares; TOKEN_NAMES
+# gives the name shown in error messages.
+TT_INT        = 0
+TT_FLOAT      = 1
+TT_STRING     = 2
+TT_FSTRING    = 3   # interpolated string parts
+TT_IDENTIFIER = 4
+TT_KEYWORD    = 5
+TT_PLUS       = 6
+TT_MINUS      = 7
+TT_MUL        = 8
+TT_DIV        = 9
+TT_MOD        = 10
+TT_POW        = 11
+TT_EQ         = 12  # =
+TT_PLUSEQ     = 13  # +=
+TT_MINUSEQ    = 14  # -=
+TT_MULEQ      = 15  # *=
+TT_DIVEQ      = 16  # /=
+TT_EQEQ       = 17  # ==
+TT_NEQ        = 18  # !=
+TT_LT         = 19  # <
+TT_GT         = 20  # >
+TT_LTE        = 21  # <=
+TT_GTE        = 22  # >=
+TT_LPAREN     = 23  # (
+TT_RPAREN     = 24  # )
+TT_LBRACE     = 25  # {
+TT_RBRACE     = 26  # }
+TT_LBRACKET   = 27  # [
+TT_RBRACKET   = 28  # ]
+TT_COMMA      = 29  # ,
+TT_COLON      = 30  # :
+TT_DOT        = 31  # .
+TT_DOTDOT     = 32  # ..
+TT_ARROW      = 33  # ->
+TT_FATARROW   = 34  # =>
+TT_CMDPREFIX  = 35  # &&
+TT_NEWLINE    = 36
+TT_EOF        = 37
+
+TOKEN_NAMES = {value: name[3:] for name, value in list(globals().items())
+               if name.startswith('TT_')}
 
 KEYWORDS = {
     'fn', 'return', 'if', 'else', 'while', 'for', 'in',
@@ -52,20 +59,88 @@ KEYWORDS = {
     'true', 'false', 'none', 'use', 'break', 'continue'
 }
 
+TWO_CHAR_OPS = {
+    '**': TT_POW,    '..': TT_DOTDOT, '=>': TT_FATARROW, '->': TT_ARROW,
+    '+=': TT_PLUSEQ, '-=': TT_MINUSEQ, '*=': TT_MULEQ,   '/=': TT_DIVEQ,
+    '==': TT_EQEQ,   '!=': TT_NEQ,    '<=': TT_LTE,      '>=': TT_GTE,
+    '&&': TT_CMDPREFIX,
+}
+
+ONE_CHAR_OPS = {
+    '+': TT_PLUS, '-': TT_MINUS, '*': TT_MUL, '/': TT_DIV,
+    '%': TT_MOD,  '=': TT_EQ,    '<': TT_LT,  '>': TT_GT,
+    '(': TT_LPAREN, ')': TT_RPAREN,
+    '{': TT_LBRACE, '}': TT_RBRACE,
+    '[': TT_LBRACKET, ']': TT_RBRACKET,
+    ',': TT_COMMA,  '.': TT_DOT, ':': TT_COLON,
+}
+
+# operator text -> token type
+OPERATORS = {**TWO_CHAR_OPS, **ONE_CHAR_OPS}
+
+# One alternative per token kind, tried in order at the current position.
+# Operators list two-char forms first, so '==' isn't read as '=' '='. A
+# float's '.' must not start a '..' range (1..5 is INT DOTDOT INT), and
+# a keyword must not be the start of a longer identifier ('format' is
+# not 'for'). Strings are scanned by Lexer.read_string (escapes,
+# interpolation), so STR only finds the quote. A run of line breaks,
+# blank lines and comment-only lines is a single NEWLINE token: the
+# parser only ever skips over them.
+TOKEN_RE = re.compile(
+    r'([ \t\r]+)'
+    r'|(\$\$[^\n]*)'
+    r'|(\n(?:[ \t\r]*(?:\$\$[^\n]*)?\n)*)'
+    r'|(\d+\.(?!\.)\d*)'
+    r'|(\d+)'
+    r'|((?:' + '|'.join(sorted(KEYWORDS, key=len, reverse=True)) + r')(?!\w))'
+    r'|([^\W\d]\w*)'
+    r'|(' + '|'.join(re.escape(op) for op in sorted(OPERATORS, key=len, reverse=True)) + ')'
+    r'|(["\'])'
+)
+
+# TOKEN_RE's capture groups in order, numbered as m.lastindex reports
+# them; tokenize tests the most frequent kinds first.
+G_WS, G_COMMENT, G_NL, G_FLOAT, G_INT, G_KW, G_ID, G_OP, G_STR = range(1, 10)
+
+# Runs of string-literal text that read_string can copy as one slice:
+# no closing quote or escape, and no '{' in "..." strings.
+STRING_TEXT_RE = {
+    '"': re.compile(r'[^"\\{]+'),
+    "'": re.compile(r"[^'\\]+"),
+}
+
+# Escape character -> the character it stands for; any other escaped
+# character stands for itself
+ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '\\': '\\', "'": "'", '"': '"', '{': '{'}
+
+# Lets nested interpolation braces be matched by jumping brace to brace
+BRACE_RE = re.compile(r'[{}]')
+
+
+def line_column(source: str, pos: int) -> tuple[int, int]:
+    """1-based (line, column) of offset `pos` in `source`. Only errors
+    need these, so tokens store the offset alone."""
+    line_start = source.rfind('\n', 0, pos) + 1
+    return source.count('\n', 0, pos) + 1, pos - line_start + 1
 
+
+# Kept as a slotted class rather than a namedtuple: building tokens costs
+# about the same either way, but the parser reads tok.type/tok.value far
+# more often, and slot reads are faster than namedtuple field getters.
 class Token:
-    def __init__(self, type_, value=None, line=0, column=0):
-        self.type   = type_
-        self.value  = value
-        self.line   = line
-        self.column = column
+    __slots__ = ('type', 'value', 'pos')
 
-    def __repr__(self):
-        return f'Token({self.type}, {self.value!r})'
+    def __init__(self, type_: int, value: Any = None, pos: int = 0):
+        self.type  = type_
+        self.value = value
+        self.pos   = pos    # offset in the source; see line_column
+
+    def __repr__(self) -> str:
+        return f'Token({TOKEN_NAMES[self.type]}, {self.value!r})'
 
 
 class LexerError(Exception):
-    def __init__(self, msg, line, column=0, hint=""):
+    def __init__(self, msg: str, line: int, column: int = 0, hint: str = ""):
         self.line = line
         self.column = column
         self.msg = msg
@@ -76,216 +151,142 @@ class LexerError(Exception):
 class Lexer:
     def __init__(self, source: str):
         self.source = source
-        self.pos    = 0
-        self.line   = 1
-        self.column = 1
+        self.pos    : int = 0
         self.tokens : list[Token] = []
-
-    def current(self):
-        if self.pos < len(self.source):
-            return self.source[self.pos]
-        return None
-
-    def peek(self, offset=1):
-        idx = self.pos + offset
-        if idx < len(self.source):
-            return self.source[idx]
-        return None
-
-    def advance(self):
-        ch = self.source[self.pos]
-        self.pos += 1
-        if ch == '\n':
-            self.line += 1
-            self.column = 1
-        else:
-            self.column += 1
-        return ch
-
-    def skip_whitespace(self):
-        while self.current() in (' ', '\t', '\r'):
-            self.advance()
-
-    def skip_comment(self):
-        # Comments start with $$
-        while self.current() is not None and self.current() != '\n':
-            self.advance()
-
-    def read_string(self, quote_char):
-        start_col = self.column
-        start_line = self.line
-        self.advance()  # skip opening quote
-        result = []
+        # Interpolated literal parts -> the first equal parts tuple, so a
+        # template repeated across the source is stored once
+        self.fstrings : dict = {}
+
+    def error(self, msg: str, pos, hint: str) -> LexerError:
+        return LexerError(msg, *line_column(self.source, pos), hint)
+
+    def read_string(self, quote_char: str) -> tuple:
+        """Scan a string literal starting at its opening quote; leaves
+        pos just past the closing quote."""
+        src = self.source
+        n = len(src)
+        start = self.pos
+        pos = start + 1  # skip opening quote
         has_interpolation = False
-        interp_parts = []  # list of (type, value): 'str' or 'expr'
-        current_str = []
-
-        while self.current() is not None and self.current() != quote_char:
-            if self.current() == '\\' :
-                self.advance()
-                esc = self.advance()
-                escape_map = {'n': '\n', 't': '\t', 'r': '\r', '\\': '\\', "'": "'", '"': '"', '{': '{'}
-                current_str.append(escape_map.get(esc, esc))
-            elif self.current() == '{' and quote_char == '"':
+        interp_parts : list[tuple[str, str]] = []  # (type, value): 'str' or 'expr'
+        current_str  : list[str] = []
+        append = current_str.append
+        text = STRING_TEXT_RE[quote_char].match
+
+        # Most literals have no escapes or interpolation: one slice
+        m = text(src, pos)
+        if m is not None:
+            end = m.end()
+            if end < n and src[end] == quote_char:
+                self.pos = end + 1
+                return ('string', m.group())
+
+        while pos < n:
+            m = text(src, pos)
+            if m is not None:
+                append(m.group())
+                pos = m.end()
+                if pos == n:
+                    break
+            ch = src[pos]
+            if ch == quote_char:
+                break
+            pos += 1
+            if ch == '\\':
+                if pos == n:
+                    break
+                esc = src[pos]
+                pos += 1
+                append(ESCAPES.get(esc, esc))
+            else:  # '{' in a "..." string
                 # String interpolation: {expression}
                 has_interpolation = True
                 if current_str:
                     interp_parts.append(('str', ''.join(current_str)))
                     current_str = []
-                self.advance()  # skip '{'
-                expr_chars = []
-                depth = 1
-                while self.current() is not None and depth > 0:
-                    if self.current() == '{':
-                        depth += 1
-                    elif self.current() == '}':
-                        depth -= 1
-                        if depth == 0:
-                            break
-                    expr_chars.append(self.advance())
-                if self.current() != '}':
-                    raise LexerError('Unterminated string interpolation', self.line, self.column, 'Did you forget a closing }?')
-                self.advance()  # skip '}'
-                interp_parts.append(('expr', ''.join(expr_chars)))
-            else:
-                current_str.append(self.advance())
-
-        if self.current() != quote_char:
-            raise LexerError('Unterminated string literal', start_line, start_col, 'Did you forget to close the quote?')
-        self.advance()  # skip closing quote
+                    append = current_str.append
+                end = src.find('}', pos)
+                if end != -1 and src.find('{', pos, end) != -1:
+                    end = self.closing_brace(pos)
+                if end == -1:
+                    raise self.error('Unterminated string interpolation', n, 'Did you forget a closing }?')
+                interp_parts.append(('expr', src[pos:end]))
+                pos = end + 1  # skip '}'
+
+        if pos == n:
+            raise self.error('Unterminated string literal', start, 'Did you forget to close the quote?')
+        self.pos = pos + 1  # skip closing quote
 
         if has_interpolation:
             if current_str:
                 interp_parts.append(('str', ''.join(current_str)))
-            return ('fstring', interp_parts)
+            parts = tuple(interp_parts)
+            return ('fstring', self.fstrings.setdefault(parts, parts))
         return ('string', ''.join(current_str))
 
-    def read_number(self):
-        start = self.pos
-        is_float = False
-        while self.current() is not None and self.current().isdigit():
-            self.advance()
-        if self.current() == '.' and self.peek() != '.':
-            is_float = True
-            self.advance()
-            while self.current() is not None and self.current().isdigit():
-                self.advance()
-        text = self.source[start:self.pos]
-        if is_float:
-            return TT_FLOAT, float(text)
-        return TT_INT, int(text)
-
-    def read_identifier(self):
-        start = self.pos
-        while self.current() is not None and (self.current().isalnum() or self.current() == '_'):
-            self.advance()
-        word = self.source[start:self.pos]
-        if word in KEYWORDS:
-            return TT_KEYWORD, word
-        return TT_IDENTIFIER, word
+    def closing_brace(self, pos) -> int:
+        """Offset of the '}' closing the '{' just before `pos`, skipping
+        nested pairs; -1 if there is none."""
+        depth = 1
+        for brace in BRACE_RE.finditer(self.source, pos):
+            if brace.group() == '{':
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return brace.start()
+        return -1
 
     def tokenize(self) -> list[Token]:
-        while self.current() is not None:
-            self.skip_whitespace()
-            ch = self.current()
-            line = self.line
-            column = self.column
-
-            if ch is None:
-                break
-
-            # Comment
-            if ch == '$' and self.peek() == '$':
-                self.advance(); self.advance()
-                self.skip_comment()
-                continue
-
-            # Newline
-            if ch == '\n':
-                self.advance()
-                self.tokens.append(Token(TT_NEWLINE, None, line, column))
-                continue
-
-            # String literals
-            if ch in ('"', "'"):
-                result = self.read_string(ch)
+        """Scan the whole source with TOKEN_RE, one match per token."""
+        source = self.source
+        tokens = self.tokens
+        append = tokens.append
+        match  = TOKEN_RE.match
+        end    = len(source)
+        pos    = self.pos
+
+        while pos < end:
+            m = match(source, pos)
+            if m is None:
+                raise self.error(f"Unknown character '{source[pos]}'", pos, "Remove the character or check for a typo.")
+            group = m.lastindex
+
+            if group == G_WS or group == G_COMMENT:
+                pass
+
+            elif group == G_ID:
+                # Interned so scope lookups by name compare by identity
+                append(Token(TT_IDENTIFIER, sys.intern(m.group()), pos))
+
+            elif group == G_OP:
+                text = m.group()
+                append(Token(OPERATORS[text], text, pos))
+
+            elif group == G_NL:
+                append(Token(TT_NEWLINE, None, pos))
+
+            elif group == G_KW:
+                append(Token(TT_KEYWORD, sys.intern(m.group()), pos))
+
+            elif group == G_INT:
+                append(Token(TT_INT, int(m.group()), pos))
+
+            elif group == G_FLOAT:
+                append(Token(TT_FLOAT, float(m.group()), pos))
+
+            else:  # STR: only the opening quote matched; read_string scans the rest
+                self.pos = pos
+                result = self.read_string(m.group())
                 if result[0] == 'fstring':
-                    self.tokens.append(Token(TT_FSTRING, result[1], line, column))
+                    append(Token(TT_FSTRING, result[1], pos))
                 else:
-                    self.tokens.append(Token(TT_STRING, result[1], line, column))
-                continue
-
-            # Numbers
-            if ch.isdigit():
-                tt, val = self.read_number()
-                self.tokens.append(Token(tt, val, line, column))
-                continue
-
-            # Identifiers / keywords
-            if ch.isalpha() or ch == '_':
-                tt, val = self.read_identifier()
-                self.tokens.append(Token(tt, val, line, column))
-                continue
-
-            # Two-char operators first
-            two = ch + (self.peek() or '')
-            if two == '**':
-                self.advance(); self.advance()
-                self.tokens.append(Token(TT_POW, '**', line, column)); continue
-            if two == '..':
-                self.advance(); self.advance()
-                self.tokens.append(Token(TT_DOTDOT, '..', line, column)); continue
-            if two == '=>':
-                self.advance(); self.advance()
-                self.tokens.append(Token(TT_FATARROW, '=>', line, column)); continue
-            if two == '->':
-                self.advance(); self.advance()
-                self.tokens.append(Token(TT_ARROW, '->', line, column)); continue
-            if two == '+=':
-                self.advance(); self.advance()
-                self.tokens.append(Token(TT_PLUSEQ, '+=', line, column)); continue
-            if two == '-=':
-                self.advance(); self.advance()
-                self.tokens.append(Token(TT_MINUSEQ, '-=', line, column)); continue
-            if two == '*=':
-                self.advance(); self.advance()
-                self.tokens.append(Token(TT_MULEQ, '*=', line, column)); continue
-            if two == '/=':
-                self.advance(); self.advance()
-                self.tokens.append(Token(TT_DIVEQ, '/=', line, column)); continue
-            if two == '==':
-                self.advance(); self.advance()
-                self.tokens.append(Token(TT_EQEQ, '==', line, column)); continue
-            if two == '!=':
-                self.advance(); self.advance()
-                self.tokens.append(Token(TT_NEQ, '!=', line, column)); continue
-            if two == '<=':
-                self.advance(); self.advance()
-                self.tokens.append(Token(TT_LTE, '<=', line, column)); continue
-            if two == '>=':
-                self.advance(); self.advance()
-                self.tokens.append(Token(TT_GTE, '>=', line, column)); continue
-
-            # Single-char operators
-            # && command prefix
-            if two == '&&':
-                self.advance(); self.advance()
-                self.tokens.append(Token(TT_CMDPREFIX, '&&', line, column)); continue
-
-            simple = {
-                '+': TT_PLUS, '-': TT_MINUS, '*': TT_MUL, '/': TT_DIV,
-                '%': TT_MOD,  '=': TT_EQ,    '<': TT_LT,  '>': TT_GT,
-                '(': TT_LPAREN, ')': TT_RPAREN,
-                '{': TT_LBRACE, '}': TT_RBRACE,
-                '[': TT_LBRACKET, ']': TT_RBRACKET,
-                ',': TT_COMMA,  '.': TT_DOT, ':': TT_COLON,
-            }
-            if ch in simple:
-                self.advance()
-                self.tokens.append(Token(simple[ch], ch, line, column))
+                    append(Token(TT_STRING, result[1], pos))
+                pos = self.pos
                 continue
 
-            raise LexerError(f"Unknown character '{ch}'", line, column, "Remove the character or check for a typo.")
+            pos = m.end()
 
-        self.tokens.append(Token(TT_EOF, None, self.line, self.column))
-        return self.tokens
+        self.pos = pos
+        append(Token(TT_EOF, None, pos))
+        return tokens
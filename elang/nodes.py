@@ -4,69 +4,115 @@
 # ============================================================
 
 class Node:
-    pass
+    __slots__ = ()
 
 # --- Literals ---
 class NumberNode(Node):
+    __slots__ = ('value',)
     def __init__(self, value):
         self.value = value
 
 class StringNode(Node):
+    __slots__ = ('value',)
     def __init__(self, value):
         self.value = value
 
 class BoolNode(Node):
+    __slots__ = ('value',)
     def __init__(self, value: bool):
         self.value = value
 
 class NoneNode(Node):
-    pass
+    __slots__ = ()
+
+# Literal nodes are never mutated once built, so the common constants
+# are shared rather than allocated at every use.
+NONE_NODE  = NoneNode()
+TRUE_NODE  = BoolNode(True)
+FALSE_NODE = BoolNode(False)
+EMPTY_STRING_NODE = StringNode('')
 
 # --- Variable ---
 class IdentifierNode(Node):
+    __slots__ = ('name', 'slot', 'depth')
     def __init__(self, name):
-        self.name = name
+        self.name  = name
+        self.slot  = None   # frame index, set by resolver (None = lookup by name)
+        self.depth = 0      # frames to hop to reach the owning scope
 
 class AssignNode(Node):
+    __slots__ = ('name', 'value', 'slot')
     def __init__(self, name, value):
         self.name  = name
         self.value = value
+        self.slot  = None   # frame index, set by resolver
 
 # --- Operations ---
+# Operator -> opcode; the evaluator's handler tables use the same order
+BINARY_OPS = {
+    '+': 0, '-': 1, '*': 2, '/': 3, '%': 4, '**': 5,
+    '==': 6, '!=': 7, '<': 8, '>': 9, '<=': 10, '>=': 11,
+    'and': 12, 'or': 13,
+}
+UNARY_OPS = {'-': 0, 'not': 1}
+
+# '+' whose operands are known to be numbers: no string coercion check
+TYPED_ADD = 14
+
 class BinOpNode(Node):
+    __slots__ = ('left', 'op', 'op_id', 'right', 'code')
     def __init__(self, left, op, right):
         self.left  = left
         self.op    = op
+        self.op_id = BINARY_OPS[op]
         self.right = right
+        self.code  = None   # flat code, set by compiler.compile_program
 
 class UnaryOpNode(Node):
+    __slots__ = ('op', 'op_id', 'operand', 'code')
     def __init__(self, op, operand):
         self.op      = op
+        self.op_id   = UNARY_OPS[op]
         self.operand = operand
+        self.code    = None   # flat code, set by compiler.compile_program
 
 # --- Say (output) ---
+SAY_MODIFIERS = {'newl': '\n', 'space': ' ', 'tab': '\t'}
+
 class SayNode(Node):
     """say(expr).newl.tab.space etc."""
-    def __init__(self, expr, modifiers: list):
+    __slots__ = ('expr', 'parts', 'modifiers', 'end')
+    def __init__(self, expr, modifiers: list, parts=None):
         self.expr      = expr   # expression to print
+        self.parts     = parts  # say(a, b, c): expressions printed space-separated
         self.modifiers = modifiers  # list of strings: 'newl', 'space', 'tab'
+        self.end       = ''.join(SAY_MODIFIERS.get(m, '') for m in modifiers)
 
 # --- Take (input) ---
 class TakeNode(Node):
     """take() or take("prompt")"""
+    __slots__ = ('prompt',)
     def __init__(self, prompt=None):
         self.prompt = prompt
 
 # --- Type cast method calls ---
 class MethodCallNode(Node):
     """expr.method(args)"""
+    __slots__ = ('obj', 'method', 'args', 'has_args',
+                 '_cache_type', '_cache_handler', '_cache_direct')
     def __init__(self, obj, method, args=None):
         self.obj    = obj
         self.method = method
         self.args   = args if args is not None else []
+        self.has_args = bool(self.args)
+        # Inline cache filled by the evaluator: receiver type -> handler
+        self._cache_type    = None
+        self._cache_handler = None
+        self._cache_direct  = False   # handler takes just the receiver
 
 # --- If/Else ---
 class IfNode(Node):
+    __slots__ = ('condition', 'then_block', 'else_block')
     def __init__(self, condition, then_block, else_block=None):
         self.condition  = condition
         self.then_block = then_block
@@ -74,6 +120,7 @@ class IfNode(Node):
 
 # --- While ---
 class WhileNode(Node):
+    __slots__ = ('condition', 'body')
     def __init__(self, condition, body):
         self.condition = condition
         self.body      = body
@@ -81,6 +128,8 @@ class WhileNode(Node):
 # --- For (range) ---
 class ForRangeNode(Node):
     """for (i in start..end step N reverse) { }"""
+    __slots__ = ('var', 'start', 'end', 'step', 'reverse', 'body',
+                 'slot', 'accumulate', 'numeric')
     def __init__(self, var, start, end, step=None, reverse=False, body=None):
         self.var     = var
         self.start   = start
@@ -88,53 +137,75 @@ class ForRangeNode(Node):
         self.step    = step
         self.reverse = reverse
         self.body    = body
+        self.slot    = None   # frame index of `var`, set by resolver
+        self.accumulate = None   # (name, slot) of a `s += var` body, set by compiler
+        self.numeric    = None   # numba_jit.NumericLoop for arithmetic-only bodies
 
 # --- For (each) ---
 class ForEachNode(Node):
     """for (x in collection) { }"""
+    __slots__ = ('var', 'iterable', 'body', 'slot')
     def __init__(self, var, iterable, body):
         self.var      = var
         self.iterable = iterable
         self.body     = body
+        self.slot     = None   # frame index of `var`, set by resolver
 
 # --- Functions ---
 class FunctionDefNode(Node):
+    __slots__ = ('name', 'params', 'body', 'return_type', 'slots', 'num_slots')
     def __init__(self, name, params, body, return_type=None):
         self.name        = name
         self.params      = params
         self.body        = body
         self.return_type = return_type
+        self.slots       = None   # name -> frame index, set by resolver
+        self.num_slots   = 0
 
 class FunctionCallNode(Node):
+    __slots__ = ('name', 'args', 'is_global',
+                 '_cache_env', '_cache_version', '_cache_fn')
     def __init__(self, name, args):
         self.name = name
         self.args = args
+        self.is_global = False   # name is bound in no enclosing function, set by resolver
+        # Callee cache filled by the evaluator, valid while the global
+        # environment's version is unchanged
+        self._cache_env     = None
+        self._cache_version = -1
+        self._cache_fn      = None
 
 class ReturnNode(Node):
+    __slots__ = ('value',)
     def __init__(self, value):
         self.value = value
 
 # --- Block ---
 class BlockNode(Node):
+    __slots__ = ('statements',)
     def __init__(self, statements):
         self.statements = statements
 
 # --- Built-in commands (&&name) ---
 class BuiltinCommandNode(Node):
+    __slots__ = ('command',)
     def __init__(self, command: str):
         self.command = command  # e.g. 'who.is.eusha'
 
 # --- Arrays / Lists ---
 class ListNode(Node):
+    __slots__ = ('elements',)
     def __init__(self, elements):
         self.elements = elements
 
 class IndexGetNode(Node):
+    __slots__ = ('target', 'index')
     def __init__(self, target, index):
         self.target = target
         self.index  = index
 
 class IndexSetNode(Node):
+    __slots__ = ('target', 'index', 'value')
     def __init__(self, target, index, value):
         self.target = target
         self.index  = index
@@ -142,38 +213,89 @@ class IndexSetNode(Node):
 
 # --- Modules ---
 class UseNode(Node):
+    __slots__ = ('module_name',)
     def __init__(self, module_name):
         self.module_name = module_name
 
 # --- Lambdas ---
 class LambdaNode(Node):
+    __slots__ = ('params', 'body', 'slots', 'num_slots')
     def __init__(self, params, body):
-        self.params = params
-        self.body   = body
+        self.params    = params
+        self.body      = body
+        self.slots     = None   # name -> frame index, set by resolver
+        self.num_slots = 0
 
 # --- Loop Control Flow ---
 class BreakNode(Node):
-    pass
+    __slots__ = ()
 
 class ContinueNode(Node):
-    pass
+    __slots__ = ()
 
 # --- String Interpolation ---
 class FStringNode(Node):
     """Interpolated string: "Hello {name}, you are {age}!" """
+    __slots__ = ('exprs', 'template')
     def __init__(self, parts):
-        self.parts = parts  # list of (type, value): 'str' or 'expr' (Node)
+        # parts: list of (type, value): 'str' or 'expr' (Node). Literal
+        # text is baked into a str.format template with one '{}' per expr.
+        template = []
+        self.exprs = []
+        for kind, value in parts:
+            if kind == 'str':
+                template.append(value.replace('{', '{{').replace('}', '}}'))
+            else:
+                template.append('{}')
+                self.exprs.append(value)
+        self.template = ''.join(template)
 
 # --- Compound Assignment ---
 class CompoundAssignNode(Node):
     """x += 1, x -= 1, etc."""
+    __slots__ = ('name', 'op', 'op_id', 'value', 'slot')
     def __init__(self, name, op, value):
         self.name  = name
         self.op    = op      # '+', '-', '*', '/'
+        self.op_id = BINARY_OPS[op]
         self.value = value
+        self.slot  = None    # frame index, set by resolver
 
 # --- Object Literals ---
 class ObjectLiteralNode(Node):
     """{key: value, key: value}"""
+    __slots__ = ('pairs',)
     def __init__(self, pairs):
         self.pairs = pairs  # list of (key_node, value_node)
+
+
+# --- Traversal ---
+def child_nodes(node):
+    """Yield the direct child nodes of `node`, looking inside lists and (kind, node) pairs."""
+    for name in node.__slots__:
+        value = getattr(node, name)
+        if isinstance(value, Node):
+            yield value
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                if isinstance(item, Node):
+                    yield item
+                elif isinstance(item, tuple):
+                    for sub in item:
+                        if isinstance(sub, Node):
+                            yield sub
+
+
+def map_children(node, fn):
+    """Replace every direct child `c` of `node` with `fn(c)`, in place.
+    Mirrors the shapes child_nodes looks at."""
+    for name in node.__slots__:
+        value = getattr(node, name)
+        if isinstance(value, Node):
+            setattr(node, name, fn(value))
+        elif isinstance(value, list):
+            for i, item in enumerate(value):
+                if isinstance(item, Node):
+                    value[i] = fn(item)
+                elif isinstance(item, tuple):
+                    value[i] = tuple(fn(sub) if isinstance(sub, Node) else sub for sub in item)
@@ -0,0 +1,251 @@
+
+# ============================================================
+#  Eusha Language - Numeric Loop JIT
+#  Runs arithmetic-only range loops as generated Python code,
+#  compiled with Numba's @njit when it is installed.
+# ============================================================
+#
+#  A loop such as
+#
+#      for (i in 1..n) { s = s + i * i }
+#
+#  has a body made only of assignments over numbers, names and
+#  + - * / %. Such a body is emitted as a standalone function
+#
+#      def _loop(start, stop, step, v0):
+#          for v1 in range(start, stop, step):
+#              v0 = (v0 + (v1 * v1))
+#          return v0, v1
+#
+#  which takes every variable it touches as an argument and returns the
+#  ones it writes. It is pure, so when anything goes wrong (a value is
+#  not a number, division by zero, Numba can't type it) the caller simply
+#  runs the loop on the tree-walker instead, which reports errors as usual.
+#
+#  Numba works on machine ints while Elang ints are unbounded, so the
+#  @njit version is only used when every variable is a float and every
+#  int-valued subexpression provably stays below 2**53; everything else
+#  runs the same source as plain Python.
+
+from nodes import *
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Largest int magnitude Numba may see: int64 doesn't overflow and the
+# int -> float conversions are exact, as they are in Python.
+EXACT_INT_LIMIT = 2 ** 53
+
+LOOP_OPS = ('+', '-', '*', '/', '%')
+
+# Generated source -> [python function, njit function or None]
+_CACHE = {}
+
+
+class NumericLoop:
+    """A compiled range loop; see `numeric_loop`."""
+    def __init__(self, fn, var, state, inputs, write_first, int_exprs):
+        self.fn          = fn            # [python fn, njit fn or None], shared via _CACHE
+        self.var         = var           # loop variable name
+        self.state       = state         # names the body assigns, in argument order
+        self.inputs      = inputs        # names the body only reads
+        self.write_first = write_first   # state names assigned before any read
+        self.int_exprs   = int_exprs     # int-valued subtrees, or None if Numba may not run it
+
+    def run(self, rng, env):
+        """Run the loop over the non-empty range `rng` in `env`.
+
+        Returns False, without touching `env`, if the interpreter must run
+        it instead.
+        """
+        args = [rng.start, rng.stop, rng.step]
+        floats = True
+        for name in self.state + self.inputs:
+            try:
+                value = env.get(name)
+            except Exception:   # undefined name
+                # A name assigned before it is read doesn't need to exist yet
+                if name not in self.write_first:
+                    return False
+                value = None
+            t = type(value)
+            if t is not int and t is not float and value is not None:
+                return False
+            floats = floats and t is float
+            args.append(value)
+
+        py_fn, jit_fn = self.fn
+        results = None
+        if (jit_fn is not None and floats and self.int_exprs is not None
+                and self._ints_exact(rng)):
+            try:
+                results = jit_fn(*args)
+            except Exception:
+                self.fn[1] = None   # Numba can't handle this loop
+        if results is None:
+            try:
+                results = py_fn(*args)
+            except Exception:
+                return False
+
+        for name, value in zip(self.state, results):
+            env.assign(name, value)
+        env.set(self.var, results[-1])
+        return True
+
+    def _ints_exact(self, rng):
+        bound = max(abs(rng[0]), abs(rng[-1]))
+        return all(_int_bound(e, self.var, bound) < EXACT_INT_LIMIT
+                   for e in self.int_exprs)
+
+
+def numeric_loop(loop):
+    """Return a NumericLoop for `loop` (a ForRangeNode) if its body is
+    arithmetic-only, else None."""
+    body = loop.body
+    statements = body.statements if type(body) is BlockNode else [body]
+    if not statements:
+        return None
+
+    var = loop.var
+    state, reads, write_first = [], [], set()
+    for stmt in statements:
+        t = type(stmt)
+        if t is AssignNode:
+            value = stmt.value
+        elif t is CompoundAssignNode:
+            if stmt.op not in LOOP_OPS:
+                return None
+            value = stmt.value
+            reads.append(stmt.name)
+        else:
+            return None
+        if stmt.name == var or not _names(value, reads):
+            return None
+        if stmt.name not in state:
+            if stmt.name not in reads:
+                write_first.add(stmt.name)
+            state.append(stmt.name)
+    inputs = []
+    for name in reads:
+        if name != var and name not in state and name not in inputs:
+            inputs.append(name)
+
+    # Python locals are v0, v1, ... so Elang names can't clash with keywords
+    local = {name: f'v{i}' for i, name in enumerate(state + inputs + [var])}
+    lines = []
+    for stmt in statements:
+        expr = _source(stmt.value, local)
+        if expr is None:
+            return None
+        target = local[stmt.name]
+        if type(stmt) is CompoundAssignNode:
+            expr = f'({target} {stmt.op} {expr})'
+        lines.append(f'        {target} = {expr}')
+    params = ', '.join(['start', 'stop', 'step'] + [local[n] for n in state + inputs])
+    returns = ', '.join([local[n] for n in state] + [local[var]])
+    source = (
+        f'def _loop({params}):\n'
+        f'    for {local[var]} in range(start, stop, step):\n'
+        + '\n'.join(lines) + '\n'
+        f'    return ({returns},)\n'
+    )
+    fn = _compile(source)
+    if fn is None:
+        return None
+
+    int_exprs = []
+    for stmt in statements:
+        kind = _collect_ints(stmt.value, var, int_exprs)
+        if kind is int and type(stmt) is AssignNode:
+            int_exprs = None   # Numba would keep the variable a float
+            break
+    return NumericLoop(fn, var, state, inputs, write_first, int_exprs)
+
+
+def _names(node, reads):
+    """Append the names `node` reads to `reads`; False if it isn't arithmetic."""
+    t = type(node)
+    if t is NumberNode:
+        return True
+    if t is IdentifierNode:
+        reads.append(node.name)
+        return True
+    if t is BinOpNode:
+        return node.op in LOOP_OPS and _names(node.left, reads) and _names(node.right, reads)
+    if t is UnaryOpNode:
+        return node.op == '-' and _names(node.operand, reads)
+    return False
+
+
+def _source(node, local):
+    t = type(node)
+    if t is NumberNode:
+        text = repr(node.value)
+        if text in ('inf', '-inf', 'nan'):
+            return None
+        return f'({text})'
+    if t is IdentifierNode:
+        return local[node.name]
+    if t is BinOpNode:
+        left = _source(node.left, local)
+        right = _source(node.right, local)
+        if left is None or right is None:
+            return None
+        return f'({left} {node.op} {right})'
+    left = _source(node.operand, local)
+    return None if left is None else f'(-{left})'
+
+
+def _compile(source):
+    if source in _CACHE:
+        return _CACHE[source]
+    scope = {}
+    try:
+        exec(source, {}, scope)
+    except (SyntaxError, RecursionError, MemoryError):
+        return None
+    py_fn = scope['_loop']
+    jit_fn = numba.njit(py_fn) if numba is not None else None
+    _CACHE[source] = fn = [py_fn, jit_fn]
+    return fn
+
+
+def _collect_ints(node, var, out):
+    """Type `node` as it would be if every variable except the loop
+    variable were a float; returns int or float and appends every
+    int-valued subtree to `out`."""
+    t = type(node)
+    if t is NumberNode:
+        kind = type(node.value)
+    elif t is IdentifierNode:
+        kind = int if node.name == var else float
+    elif t is UnaryOpNode:
+        kind = _collect_ints(node.operand, var, out)
+    else:
+        left = _collect_ints(node.left, var, out)
+        right = _collect_ints(node.right, var, out)
+        kind = float if node.op == '/' or float in (left, right) else int
+    if kind is int:
+        out.append(node)
+    return kind
+
+
+def _int_bound(node, var, bound):
+    """Upper bound on |value| of an int-valued subtree when |var| <= bound."""
+    t = type(node)
+    if t is NumberNode:
+        return abs(node.value)
+    if t is IdentifierNode:
+        return bound
+    if t is UnaryOpNode:
+        return _int_bound(node.operand, var, bound)
+    right = _int_bound(node.right, var, bound)
+    if node.op == '%':
+        return right
+    left = _int_bound(node.left, var, bound)
+    if node.op == '*':
+        return left * right
+    return left + right
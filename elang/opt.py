@@ -0,0 +1,137 @@
+
+# ============================================================
+#  Eusha Language - AST Optimizer
+#  Folds constant expressions once, before execution.
+# ============================================================
+#
+#  `60 * 60 * 24` or `-1` inside a loop body would otherwise be
+#  recomputed on every pass. fold() replaces each operator whose operands
+#  are all literals with the literal it evaluates to. An expression that
+#  would fail at runtime (1 / 0, "a" - 1) is left alone, so the error
+#  still happens when, and only if, that code runs.
+
+import operator
+from string import Formatter
+from nodes import *
+
+LITERAL_NODES = (NumberNode, StringNode, BoolNode, NoneNode)
+
+# Largest string a fold may produce; "ab" * 1000000 stays a runtime op.
+MAX_FOLDED_STR = 4096
+
+# Largest int exponent folded for '**'
+MAX_FOLDED_EXPONENT = 256
+
+
+def _add(left, right):
+    # Same string coercion as the evaluator's '+'
+    if isinstance(left, str) or isinstance(right, str):
+        return str(left) + str(right)
+    return left + right
+
+def _div(left, right):
+    if right == 0:
+        raise ZeroDivisionError   # the evaluator reports this at runtime
+    return left / right
+
+def _pow(left, right):
+    if isinstance(right, int) and abs(right) > MAX_FOLDED_EXPONENT:
+        raise OverflowError
+    return left ** right
+
+def _mul(left, right):
+    for text, count in ((left, right), (right, left)):
+        if isinstance(text, str) and isinstance(count, int) and len(text) * count > MAX_FOLDED_STR:
+            raise OverflowError
+    return left * right
+
+
+FOLD_OPS = {
+    '+': _add, '-': operator.sub, '*': _mul, '/': _div, '%': operator.mod, '**': _pow,
+    '==': operator.eq, '!=': operator.ne,
+    '<': operator.lt, '>': operator.gt, '<=': operator.le, '>=': operator.ge,
+    'and': lambda l, r: bool(l) and bool(r),
+    'or':  lambda l, r: bool(l) or bool(r),
+}
+
+
+def fold(node):
+    """Fold constant subexpressions of `node` in place; returns the node
+    that should replace it (a new literal, or `node` itself)."""
+    map_children(node, fold)
+    t = type(node)
+    if t is BinOpNode:
+        if type(node.left) in LITERAL_NODES and type(node.right) in LITERAL_NODES:
+            fn = FOLD_OPS.get(node.op)
+            if fn is not None:
+                left, right = _value(node.left), _value(node.right)
+                return _fold_value(lambda: fn(left, right), node)
+    elif t is UnaryOpNode:
+        if type(node.operand) in LITERAL_NODES:
+            value = _value(node.operand)
+            if node.op == '-':
+                return _fold_value(lambda: -value, node)
+            if node.op == 'not':
+                return FALSE_NODE if value else TRUE_NODE
+    elif t is FStringNode:
+        _fold_fstring(node)
+    elif t is SayNode and node.parts is not None:
+        if all(type(part) in LITERAL_NODES for part in node.parts):
+            node.expr = StringNode(' '.join(str(_value(part)) for part in node.parts))
+            node.parts = None
+    return node
+
+
+def _value(node):
+    return None if type(node) is NoneNode else node.value
+
+
+def _fold_value(compute, node):
+    try:
+        value = compute()
+    except (TypeError, ValueError, ArithmeticError):
+        return node
+    return _literal(value, node)
+
+
+def _literal(value, node):
+    """Wrap a folded value in its literal node; `node` if it has none."""
+    if value is None:
+        return NONE_NODE
+    if isinstance(value, bool):
+        return TRUE_NODE if value else FALSE_NODE
+    if isinstance(value, (int, float)):
+        return NumberNode(value)
+    if isinstance(value, str):
+        return StringNode(value)
+    return node
+
+
+def _literal_text(node):
+    """How say() shows a literal's value."""
+    value = _value(node)
+    if value is None:
+        return 'none'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+
+def _fold_fstring(node):
+    """Bake interpolated literals, e.g. "{60 * 60}", into the template."""
+    if not any(type(e) in LITERAL_NODES for e in node.exprs):
+        return
+    template, exprs = [], []
+    fields = iter(node.exprs)
+    for text, field, _, _ in Formatter().parse(node.template):
+        template.append(text.replace('{', '{{').replace('}', '}}'))
+        if field is None:
+            continue
+        expr = next(fields)
+        if type(expr) in LITERAL_NODES:
+            template.append(_literal_text(expr).replace('{', '{{').replace('}', '}}'))
+        else:
+            template.append('{}')
+            exprs.append(expr)
+    node.template = ''.join(template)
+    node.exprs = exprs
@@ -0,0 +1,11 @@
+# Cython declarations for parser.py, used when it is compiled as an
+# extension module (see setup.py). Declaring the parser's state as C
+# fields lets its cursor and token-list reads skip the generic
+# attribute lookup compiled code would otherwise go through.
+
+cdef class Parser:
+    cdef public list tokens
+    cdef public unicode source
+    cdef public Py_ssize_t pos
+    cdef public dict _memo
+    cdef public dict _fragments
@@ -4,8 +4,27 @@
 #  Converts a stream of tokens into an AST.
 # ============================================================
 
-from lexer import *
-from nodes import *
+# Explicit imports: mypyc, which can compile this module (see setup.py),
+# doesn't support star imports
+from lexer import (
+    Lexer, Token, TOKEN_NAMES, line_column,
+    TT_INT, TT_FLOAT, TT_STRING, TT_FSTRING, TT_IDENTIFIER, TT_KEYWORD,
+    TT_PLUS, TT_MINUS, TT_MUL, TT_DIV, TT_MOD, TT_POW,
+    TT_EQ, TT_EQEQ, TT_NEQ, TT_LT, TT_GT, TT_LTE, TT_GTE,
+    TT_PLUSEQ, TT_MINUSEQ, TT_MULEQ, TT_DIVEQ,
+    TT_LPAREN, TT_RPAREN, TT_LBRACE, TT_RBRACE, TT_LBRACKET, TT_RBRACKET,
+    TT_COMMA, TT_COLON, TT_DOT, TT_DOTDOT, TT_ARROW, TT_FATARROW,
+    TT_CMDPREFIX, TT_NEWLINE, TT_EOF,
+)
+from nodes import (
+    Node, NumberNode, StringNode, IdentifierNode,
+    AssignNode, CompoundAssignNode, BinOpNode, UnaryOpNode, SayNode, TakeNode,
+    MethodCallNode, IfNode, WhileNode, ForRangeNode, ForEachNode,
+    FunctionDefNode, FunctionCallNode, ReturnNode, BlockNode,
+    BuiltinCommandNode, ListNode, IndexGetNode, IndexSetNode, UseNode,
+    LambdaNode, BreakNode, ContinueNode, FStringNode, ObjectLiteralNode,
+    NONE_NODE, TRUE_NODE, FALSE_NODE, EMPTY_STRING_NODE,
+)
 
 
 class ParseError(Exception):
@@ -17,16 +36,51 @@ class ParseError(Exception):
         super().__init__(f'[Line {line}] Parse Error: {msg}')
 
 
+# Token types the parser tests membership in
+COMPOUND_TYPES   = frozenset((TT_PLUSEQ, TT_MINUSEQ, TT_MULEQ, TT_DIVEQ))
+RETURN_END_TYPES = frozenset((TT_NEWLINE, TT_RBRACE, TT_EOF))   # a bare `return`
+NAME_TYPES       = frozenset((TT_IDENTIFIER, TT_KEYWORD))        # method and modifier names
+BLOCK_END_TYPES  = frozenset((TT_RBRACE, TT_EOF))
+
+# Binary operator -> (precedence, right-associative); higher binds tighter.
+# Unary minus binds tighter than all of them, `not` sits at NOT_PREC.
+OR_PREC  = 1
+NOT_PREC = 3
+KEYWORD_PRECEDENCE = {'or': (OR_PREC, False), 'and': (2, False)}
+BINARY_PRECEDENCE = {
+    TT_EQEQ: (4, False), TT_NEQ: (4, False), TT_LT: (4, False),
+    TT_GT:   (4, False), TT_LTE: (4, False), TT_GTE: (4, False),
+    TT_PLUS: (5, False), TT_MINUS: (5, False),
+    TT_MUL:  (6, False), TT_DIV: (6, False), TT_MOD: (6, False),
+    TT_POW:  (7, True),
+}
+
+
 class Parser:
-    def __init__(self, tokens: list):
+    __slots__ = ('tokens', 'source', 'pos', '_memo', '_fragments')
+
+    def __init__(self, tokens: list[Token], source: str = ''):
+        self.tokens : list[Token] = tokens
+        self.source : str = source   # for turning token offsets into line/column
+        self.pos    : int = 0
+        # Index expressions parsed before a rewind: start pos -> (node, pos after ']')
+        self._memo  : dict[int, tuple[Node, int]] = {}
+        # f-string fragment text -> its tokens, shared with the parsers
+        # made for fragments so one parse lexes each fragment once
+        self._fragments : dict[str, list[Token]] = {}
+
+    def _reset(self, tokens: list[Token], source: str) -> None:
+        """Point the parser at a new token stream, as if freshly built."""
         self.tokens = tokens
+        self.source = source
         self.pos    = 0
+        self._memo.clear()
 
     # ---- helpers ----
     def current(self) -> Token:
         return self.tokens[self.pos]
 
-    def peek(self, offset=1) -> Token:
+    def peek(self, offset: int = 1) -> Token:
         idx = self.pos + offset
         if idx < len(self.tokens):
             return self.tokens[idx]
@@ -38,8 +92,12 @@ class Parser:
             self.pos += 1
         return tok
 
-    def expect(self, type_, value=None) -> Token:
-        tok = self.current()
+    def expect(self, type_: int, value: object = None) -> Token:
+        tok = self.tokens[self.pos]
+        if tok.type == type_ and (value is None or tok.value == value):
+            # Nothing expects EOF, so a match is never the last token
+            self.pos += 1
+            return tok
         if tok.type != type_:
             hint = ""
             if type_ == TT_RBRACE:
@@ -49,21 +107,26 @@ class Parser:
             elif type_ == TT_RBRACKET:
                 hint = "Did you forget a closing ']'?"
             raise ParseError(
-                f"Expected {type_!r}, got {tok.type!r} ({tok.value!r})",
-                tok.line, tok.column, hint
+                f"Expected {TOKEN_NAMES[type_]!r}, got {TOKEN_NAMES[tok.type]!r} ({tok.value!r})",
+                *self.location(tok), hint
             )
-        if value is not None and tok.value != value:
-            raise ParseError(
-                f"Expected '{value}', got '{tok.value}'",
-                tok.line, tok.column
-            )
-        return self.advance()
+        raise ParseError(
+            f"Expected '{value}', got '{tok.value}'",
+            *self.location(tok)
+        )
 
-    def skip_newlines(self):
-        while self.current().type == TT_NEWLINE:
-            self.advance()
+    def location(self, tok: Token) -> tuple[int, int]:
+        """(line, column) of `tok`, for error messages."""
+        return line_column(self.source, tok.pos)
 
-    def match(self, type_, value=None) -> bool:
+    def skip_newlines(self) -> None:
+        tokens = self.tokens
+        pos = self.pos
+        while tokens[pos].type == TT_NEWLINE:   # the list always ends with EOF
+            pos += 1
+        self.pos = pos
+
+    def match(self, type_: int, value: object = None) -> bool:
         tok = self.current()
         if tok.type != type_:
             return False
@@ -73,12 +136,12 @@ class Parser:
 
     # ---- parse entry ----
     def parse(self) -> BlockNode:
-        stmts = []
+        stmts: list[Node] = []
+        append = stmts.append
+        tokens = self.tokens
         self.skip_newlines()
-        while not self.match(TT_EOF):
-            stmt = self.parse_statement()
-            if stmt is not None:
-                stmts.append(stmt)
+        while tokens[self.pos].type != TT_EOF:
+            append(self.parse_statement())   # statement parsers always return a node
             self.skip_newlines()
         return BlockNode(stmts)
 
@@ -86,55 +149,23 @@ class Parser:
     def parse_statement(self) -> Node:
         tok = self.current()
 
-        # Function definition
-        if tok.type == TT_KEYWORD and tok.value == 'fn':
-            return self.parse_function_def()
-
-        # Return
-        if tok.type == TT_KEYWORD and tok.value == 'return':
-            return self.parse_return()
-
-        # If
-        if tok.type == TT_KEYWORD and tok.value == 'if':
-            return self.parse_if()
-
-        # While
-        if tok.type == TT_KEYWORD and tok.value == 'while':
-            return self.parse_while()
-
-        # For
-        if tok.type == TT_KEYWORD and tok.value == 'for':
-            return self.parse_for()
-
-        # say(...)
-        if tok.type == TT_KEYWORD and tok.value == 'say':
-            return self.parse_say()
-
-        # use module
-        if tok.type == TT_KEYWORD and tok.value == 'use':
-            return self.parse_use()
-
-        # break
-        if tok.type == TT_KEYWORD and tok.value == 'break':
-            self.advance()
-            return BreakNode()
-
-        # continue
-        if tok.type == TT_KEYWORD and tok.value == 'continue':
-            self.advance()
-            return ContinueNode()
+        # fn, return, if, while, for, say, use, break, continue
+        if tok.type == TT_KEYWORD:
+            handler = STATEMENT_KEYWORDS.get(tok.value)
+            if handler is not None:
+                return handler(self)
 
         # &&builtin command
-        if tok.type == TT_CMDPREFIX:
+        elif tok.type == TT_CMDPREFIX:
             return self.parse_builtin_command()
 
         # Assignment:  name = expr   OR   name[index] = expr  OR  name += expr
-        if tok.type == TT_IDENTIFIER:
+        elif tok.type == TT_IDENTIFIER:
             # Simple assignment:  name = expr
             if self.peek().type == TT_EQ:
                 return self.parse_assignment()
             # Compound assignment: name += expr, name -= expr, etc.
-            if self.peek().type in (TT_PLUSEQ, TT_MINUSEQ, TT_MULEQ, TT_DIVEQ):
+            if self.peek().type in COMPOUND_TYPES:
                 return self.parse_compound_assignment()
             # Indexed assignment: name[expr] = expr
             if self.peek().type == TT_LBRACKET:
@@ -143,6 +174,14 @@ class Parser:
         # Default: expression statement
         return self.parse_expression()
 
+    def parse_break(self) -> BreakNode:
+        self.advance()  # 'break'
+        return BreakNode()
+
+    def parse_continue(self) -> ContinueNode:
+        self.advance()  # 'continue'
+        return ContinueNode()
+
     def parse_assignment(self) -> AssignNode:
         name = self.advance().value   # identifier
         self.advance()               # consume '='
@@ -152,8 +191,7 @@ class Parser:
     def parse_compound_assignment(self) -> CompoundAssignNode:
         name = self.advance().value   # identifier
         op_tok = self.advance()       # consume +=, -=, *=, /=
-        op_map = {'+=': '+', '-=': '-', '*=': '*', '/=': '/'}
-        op = op_map[op_tok.value]
+        op = op_tok.value[0]          # '+', '-', '*' or '/'
         value = self.parse_expression()
         return CompoundAssignNode(name, op, value)
 
@@ -162,20 +200,23 @@ class Parser:
         saved_pos = self.pos
         name_tok = self.advance()  # identifier
         self.advance()  # '['
+        index_pos = self.pos
         index = self.parse_expression()
         self.expect(TT_RBRACKET)
         if self.match(TT_EQ):
             self.advance()  # '='
             value = self.parse_expression()
             return IndexSetNode(IdentifierNode(name_tok.value), index, value)
-        # Not an assignment, rewind and parse as expression
+        # Not an assignment, rewind and parse as expression; parse_postfix
+        # picks the index up from the memo instead of parsing it again
+        self._memo[index_pos] = (index, self.pos)
         self.pos = saved_pos
         return self.parse_expression()
 
     def parse_return(self) -> ReturnNode:
         self.advance()  # 'return'
-        if self.current().type in (TT_NEWLINE, TT_RBRACE, TT_EOF):
-            return ReturnNode(NoneNode())
+        if self.current().type in RETURN_END_TYPES:
+            return ReturnNode(NONE_NODE)
         value = self.parse_expression()
         return ReturnNode(value)
 
@@ -183,12 +224,7 @@ class Parser:
         self.advance()  # 'fn'
         name = self.expect(TT_IDENTIFIER).value
         self.expect(TT_LPAREN)
-        params = []
-        while not self.match(TT_RPAREN):
-            params.append(self.expect(TT_IDENTIFIER).value)
-            if self.match(TT_COMMA):
-                self.advance()
-        self.expect(TT_RPAREN)
+        params = self._parse_comma_list(TT_RPAREN, self._parse_param)
 
         return_type = None
         if self.match(TT_ARROW):
@@ -202,7 +238,7 @@ class Parser:
         self.advance()  # 'if'
         condition = self.parse_expression()
         then_block = self.parse_block()
-        else_block = None
+        else_block: Node | None = None
         self.skip_newlines()
         if self.match(TT_KEYWORD, 'else'):
             self.advance()
@@ -257,212 +293,172 @@ class Parser:
     def parse_say(self) -> SayNode:
         self.advance()  # 'say'
         self.expect(TT_LPAREN)
+        parts: list[Node] | None = None
+        expr: Node | None
         # Empty say()
         if self.match(TT_RPAREN):
             self.advance()
-            expr = StringNode('')
+            expr = EMPTY_STRING_NODE
         else:
             # Parse first expression
-            first = self.parse_expression()
-            # Multi-arg say: say(a, b, c) -> concatenate with spaces
+            expr = self.parse_expression()
+            # Multi-arg say: say(a, b, c) -> joined with spaces
             if self.match(TT_COMMA):
-                parts = [first]
+                parts = [expr]
+                expr = None
                 while self.match(TT_COMMA):
                     self.advance()
                     parts.append(self.parse_expression())
-                # Build a chain of BinOpNode(+) with spaces between
-                expr = parts[0]
-                for part in parts[1:]:
-                    expr = BinOpNode(
-                        BinOpNode(expr, '+', StringNode(' ')),
-                        '+', part
-                    )
-            else:
-                expr = first
             self.expect(TT_RPAREN)
         # Collect modifiers: .newl .space .tab
         modifiers = []
         while self.match(TT_DOT):
             next_tok = self.peek()
-            if next_tok.type not in (TT_IDENTIFIER, TT_KEYWORD):
+            if next_tok.type not in NAME_TYPES:
                 break
             self.advance()  # '.'
             mod = self.advance().value
             if mod not in ('newl', 'space', 'tab'):
                 raise ParseError(
                     f"Unknown say modifier '{mod}'",
-                    self.current().line, self.current().column,
+                    *self.location(self.current()),
                     "Valid modifiers are: .newl, .space, .tab"
                 )
             modifiers.append(mod)
-        return SayNode(expr, modifiers)
+        return SayNode(expr, modifiers, parts)
 
     def parse_use(self) -> UseNode:
         self.advance()  # 'use'
         name = self.expect(TT_IDENTIFIER).value
         return UseNode(name)
 
-    def parse_block(self) -> BlockNode:
+    def parse_block(self) -> Node:
+        """Parse a braced body. A body with a single statement is returned
+        as that statement, saving a BlockNode dispatch per execution;
+        blocks don't open a scope, so this doesn't change behaviour."""
         self.skip_newlines()
         if self.match(TT_EOF):
             raise ParseError(
                 "Expected '{' but found end of file",
-                self.current().line, self.current().column,
+                *self.location(self.current()),
                 "Did you forget to open a block with '{'?"
             )
         self.expect(TT_LBRACE)
         self.skip_newlines()
-        stmts = []
-        while not self.match(TT_RBRACE) and not self.match(TT_EOF):
-            stmt = self.parse_statement()
-            if stmt is not None:
-                stmts.append(stmt)
+        stmts: list[Node] = []
+        append = stmts.append
+        tokens = self.tokens
+        while tokens[self.pos].type not in BLOCK_END_TYPES:
+            append(self.parse_statement())
             self.skip_newlines()
         if self.match(TT_EOF):
             raise ParseError(
                 "Expected '}' but found end of file",
-                self.current().line, self.current().column,
+                *self.location(self.current()),
                 "Did you forget to close a block with '}'?"
             )
         self.expect(TT_RBRACE)
+        if len(stmts) == 1:
+            return stmts[0]
         return BlockNode(stmts)
 
     # ---- expressions (Pratt-style precedence) ----
     def parse_expression(self) -> Node:
-        return self.parse_or()
-
-    def parse_or(self) -> Node:
-        left = self.parse_and()
-        while self.match(TT_KEYWORD, 'or'):
-            op = self.advance().value
-            right = self.parse_and()
-            left = BinOpNode(left, op, right)
-        return left
-
-    def parse_and(self) -> Node:
-        left = self.parse_not()
-        while self.match(TT_KEYWORD, 'and'):
-            op = self.advance().value
-            right = self.parse_not()
-            left = BinOpNode(left, op, right)
-        return left
-
-    def parse_not(self) -> Node:
-        if self.match(TT_KEYWORD, 'not'):
-            op = self.advance().value
-            operand = self.parse_not()
-            return UnaryOpNode(op, operand)
-        return self.parse_comparison()
-
-    def parse_comparison(self) -> Node:
-        left = self.parse_add_sub()
-        cmp_types = {TT_EQEQ, TT_NEQ, TT_LT, TT_GT, TT_LTE, TT_GTE}
-        while self.current().type in cmp_types:
-            op = self.advance().value
-            right = self.parse_add_sub()
-            left = BinOpNode(left, op, right)
-        return left
-
-    def parse_add_sub(self) -> Node:
-        left = self.parse_mul_div()
-        while self.current().type in (TT_PLUS, TT_MINUS):
-            op = self.advance().value
-            right = self.parse_mul_div()
-            left = BinOpNode(left, op, right)
-        return left
-
-    def parse_mul_div(self) -> Node:
-        left = self.parse_power()
-        while self.current().type in (TT_MUL, TT_DIV, TT_MOD):
-            op = self.advance().value
-            right = self.parse_power()
-            left = BinOpNode(left, op, right)
-        return left
-
-    def parse_power(self) -> Node:
-        left = self.parse_unary()
-        if self.current().type == TT_POW:
-            op = self.advance().value
-            right = self.parse_power()  # right-associative
-            return BinOpNode(left, op, right)
-        return left
+        return self.parse_binary(OR_PREC)
+
+    # Precedence climbing: one loop covers every binary level, so a bare
+    # operand costs a single call here rather than one per level. Operator
+    # tokens are never the final EOF, so stepping past one needs no
+    # bounds check.
+    def parse_binary(self, min_prec: int) -> Node:
+        tokens = self.tokens
+        tok = tokens[self.pos]
+        left: Node
+        if min_prec <= NOT_PREC and tok.type == TT_KEYWORD and tok.value == 'not':
+            # `not` binds looser than comparisons but tighter than and/or
+            self.pos += 1
+            left = UnaryOpNode(tok.value, self.parse_binary(NOT_PREC))
+        else:
+            left = self.parse_unary()
+        while True:
+            tok = tokens[self.pos]
+            if tok.type == TT_KEYWORD:
+                info = KEYWORD_PRECEDENCE.get(tok.value)
+            else:
+                info = BINARY_PRECEDENCE.get(tok.type)
+            if info is None:
+                return left
+            prec, right_assoc = info
+            if prec < min_prec:
+                return left
+            self.pos += 1
+            right = self.parse_binary(prec if right_assoc else prec + 1)
+            left = BinOpNode(left, tok.value, right)
 
     def parse_unary(self) -> Node:
-        if self.current().type == TT_MINUS:
-            op = self.advance().value
+        tok = self.tokens[self.pos]
+        if tok.type == TT_MINUS:
+            self.pos += 1
             operand = self.parse_unary()
-            return UnaryOpNode(op, operand)
+            return UnaryOpNode(tok.value, operand)
         return self.parse_postfix()
 
     def parse_postfix(self) -> Node:
         """Handle method calls (.method()), indexing ([expr]), and dot access."""
         node = self.parse_primary()
+        tokens = self.tokens
         while True:
+            tt = tokens[self.pos].type
             # Method call: expr.method() or expr.method(args)
-            if self.match(TT_DOT):
+            if tt == TT_DOT:
                 # Accept both identifiers and keywords as method names
-                # (e.g. .reverse, .step, .in are valid method names)
-                next_tok = self.peek()
-                if next_tok.type in (TT_IDENTIFIER, TT_KEYWORD):
-                    self.advance()  # '.'
-                    method = self.advance().value
-                    args = []
-                    if self.match(TT_LPAREN):
-                        self.advance()  # '('
-                        while not self.match(TT_RPAREN):
-                            args.append(self.parse_expression())
-                            if self.match(TT_COMMA):
-                                self.advance()
-                        self.expect(TT_RPAREN)
-                    node = MethodCallNode(node, method, args)
-                else:
+                # (e.g. .reverse, .step, .in are valid method names).
+                # A '.' is never the final EOF, so the next token exists.
+                name_tok = tokens[self.pos + 1]
+                if name_tok.type not in NAME_TYPES:
                     break
+                self.pos += 2
+                if tokens[self.pos].type == TT_LPAREN:
+                    self.pos += 1
+                    args = self._parse_comma_list(TT_RPAREN, self.parse_expression)
+                else:
+                    args = []
+                node = MethodCallNode(node, name_tok.value, args)
             # Indexing: expr[index]
-            elif self.match(TT_LBRACKET):
-                self.advance()  # '['
-                index = self.parse_expression()
-                self.expect(TT_RBRACKET)
+            elif tt == TT_LBRACKET:
+                self.pos += 1
+                memo = self._memo.pop(self.pos, None) if self._memo else None
+                if memo is not None:
+                    index, self.pos = memo
+                else:
+                    index = self.parse_expression()
+                    self.expect(TT_RBRACKET)
                 node = IndexGetNode(node, index)
             else:
-                break
+                return node
         return node
 
-    def parse_primary(self) -> Node:
-        tok = self.current()
-
-        # Literals
-        if tok.type == TT_INT:
-            self.advance()
-            return NumberNode(tok.value)
-        if tok.type == TT_FLOAT:
-            self.advance()
-            return NumberNode(tok.value)
-        if tok.type == TT_STRING:
-            self.advance()
-            return StringNode(tok.value)
-        if tok.type == TT_FSTRING:
-            self.advance()
-            return self.parse_fstring(tok.value)
-        if tok.type == TT_KEYWORD and tok.value == 'true':
-            self.advance()
-            return BoolNode(True)
-        if tok.type == TT_KEYWORD and tok.value == 'false':
-            self.advance()
-            return BoolNode(False)
-        if tok.type == TT_KEYWORD and tok.value == 'none':
-            self.advance()
-            return NoneNode()
+    def _parse_comma_list(self, end_type: int, parse_elem) -> list:
+        """Parse `parse_elem()` items up to and including the `end_type`
+        closer, for call arguments and parameter lists. Commas between
+        items are optional and a trailing one is allowed."""
+        items = []
+        while not self.match(end_type):
+            items.append(parse_elem())
+            if self.match(TT_COMMA):
+                self.advance()
+        self.expect(end_type)
+        return items
 
-        # take()
-        if tok.type == TT_KEYWORD and tok.value == 'take':
-            return self.parse_take()
+    def _parse_param(self) -> str:
+        return self.expect(TT_IDENTIFIER).value
 
-        # say() as expression
-        if tok.type == TT_KEYWORD and tok.value == 'say':
-            return self.parse_say()
+    def parse_primary(self) -> Node:
+        tok = self.tokens[self.pos]
+        tt = tok.type
 
         # Identifier — possibly a function call or lambda param
-        if tok.type == TT_IDENTIFIER:
+        if tt == TT_IDENTIFIER:
             # Check for single-param lambda:  name => expr
             if self.peek().type == TT_FATARROW:
                 param = self.advance().value  # identifier
@@ -474,6 +470,27 @@ class Parser:
                 return self.parse_call(name)
             return IdentifierNode(name)
 
+        # Literals
+        if tt == TT_INT or tt == TT_FLOAT:
+            self.pos += 1
+            return NumberNode(tok.value)
+        if tt == TT_STRING:
+            self.pos += 1
+            return StringNode(tok.value)
+        if tt == TT_FSTRING:
+            self.pos += 1
+            return self.parse_fstring(tok.value)
+
+        # true, false, none; take() and say() as expressions
+        if tt == TT_KEYWORD:
+            node = KEYWORD_LITERALS.get(tok.value)
+            if node is not None:
+                self.pos += 1
+                return node
+            handler = PRIMARY_KEYWORDS.get(tok.value)
+            if handler is not None:
+                return handler(self)
+
         # Array literal: [expr, expr, ...]
         if tok.type == TT_LBRACKET:
             return self.parse_list()
@@ -487,50 +504,42 @@ class Parser:
             return self.parse_object_literal()
 
         raise ParseError(
-            f"Unexpected token {tok.type!r} ({tok.value!r})",
-            tok.line, tok.column,
+            f"Unexpected token {TOKEN_NAMES[tok.type]!r} ({tok.value!r})",
+            *self.location(tok),
             "Check your syntax near this location."
         )
 
     def parse_paren_or_lambda(self):
         """Parse either (expr) grouped expression or (params) => expr lambda."""
-        # Try to detect lambda pattern: (id, id, ...) =>
-        saved_pos = self.pos
-        self.advance()  # '('
-
-        # Check if this looks like a lambda parameter list
-        might_be_lambda = True
-        params = []
-        if self.match(TT_IDENTIFIER):
-            params.append(self.advance().value)
-            while self.match(TT_COMMA):
-                self.advance()
-                if self.match(TT_IDENTIFIER):
-                    params.append(self.advance().value)
-                else:
-                    might_be_lambda = False
-                    break
-            if might_be_lambda and self.match(TT_RPAREN):
-                self.advance()  # ')'
-                if self.match(TT_FATARROW):
-                    self.advance()  # '=>'
-                    body = self.parse_expression()
-                    return LambdaNode(params, body)
-        elif self.match(TT_RPAREN):
-            # () => expr  (zero params)
-            self.advance()  # ')'
-            if self.match(TT_FATARROW):
-                self.advance()  # '=>'
-                body = self.parse_expression()
-                return LambdaNode([], body)
-
-        # Not a lambda, rewind and parse as grouped expression
-        self.pos = saved_pos
+        header = self._scan_lambda_header()
+        if header is not None:
+            params, self.pos = header
+            body = self.parse_expression()
+            return LambdaNode(params, body)
         self.advance()  # '('
         expr = self.parse_expression()
         self.expect(TT_RPAREN)
         return expr
 
+    def _scan_lambda_header(self):
+        """Look ahead from the current '(' for a lambda header, `(a, b) =>`
+        or `() =>`. Returns (params, position after '=>'), or None for a
+        grouped expression; doesn't move self.pos."""
+        tokens = self.tokens
+        i = self.pos + 1
+        params = []
+        if tokens[i].type == TT_IDENTIFIER:
+            params.append(tokens[i].value)
+            i += 1
+            while tokens[i].type == TT_COMMA:
+                if tokens[i + 1].type != TT_IDENTIFIER:
+                    return None
+                params.append(tokens[i + 1].value)
+                i += 2
+        if tokens[i].type != TT_RPAREN or tokens[i + 1].type != TT_FATARROW:
+            return None
+        return params, i + 2
+
     def parse_list(self) -> ListNode:
         """Parse [expr, expr, ...]"""
         self.advance()  # '['
@@ -556,13 +565,7 @@ class Parser:
 
     def parse_call(self, name) -> FunctionCallNode:
         self.expect(TT_LPAREN)
-        args = []
-        while not self.match(TT_RPAREN):
-            args.append(self.parse_expression())
-            if self.match(TT_COMMA):
-                self.advance()
-        self.expect(TT_RPAREN)
-        return FunctionCallNode(name, args)
+        return FunctionCallNode(name, self._parse_comma_list(TT_RPAREN, self.parse_expression))
 
     def parse_builtin_command(self) -> BuiltinCommandNode:
         """Parse &&command — reads identifiers joined by dots as the command name."""
@@ -576,16 +579,22 @@ class Parser:
 
     def parse_fstring(self, parts):
         """Parse interpolated string parts into an FStringNode."""
-        from lexer import Lexer as FLexer
         parsed_parts = []
+        parser = None   # one fragment parser, reset for each fragment
         for kind, value in parts:
             if kind == 'str':
                 parsed_parts.append(('str', value))
             elif kind == 'expr':
-                # Re-lex and re-parse the expression fragment
-                lexer = FLexer(value)
-                tokens = lexer.tokenize()
-                parser = Parser(tokens)
+                # Re-parse the expression fragment. Only its tokens are
+                # cached: the resolver annotates each tree for its scope.
+                tokens = self._fragments.get(value)
+                if tokens is None:
+                    tokens = self._fragments[value] = Lexer(value).tokenize()
+                if parser is None:
+                    parser = Parser(tokens, value)
+                    parser._fragments = self._fragments
+                else:
+                    parser._reset(tokens, value)
                 expr_node = parser.parse_expression()
                 parsed_parts.append(('expr', expr_node))
         return FStringNode(parsed_parts)
@@ -610,8 +619,8 @@ class Parser:
                 key = StringNode(self.advance().value)
             else:
                 raise ParseError(
-                    f"Expected a key in object literal, got {self.current().type!r}",
-                    self.current().line, self.current().column,
+                    f"Expected a key in object literal, got {TOKEN_NAMES[self.current().type]!r}",
+                    *self.location(self.current()),
                     "Object keys must be identifiers or strings."
                 )
             self.expect(TT_COLON)
@@ -627,3 +636,27 @@ class Parser:
                 break
         self.expect(TT_RBRACE)
         return ObjectLiteralNode(pairs)
+
+
+# Keyword -> Parser method for the statements it starts
+STATEMENT_KEYWORDS = {
+    'fn':       Parser.parse_function_def,
+    'return':   Parser.parse_return,
+    'if':       Parser.parse_if,
+    'while':    Parser.parse_while,
+    'for':      Parser.parse_for,
+    'say':      Parser.parse_say,
+    'use':      Parser.parse_use,
+    'break':    Parser.parse_break,
+    'continue': Parser.parse_continue,
+}
+
+
+# Keyword -> the shared literal node it stands for
+KEYWORD_LITERALS = {'true': TRUE_NODE, 'false': FALSE_NODE, 'none': NONE_NODE}
+
+# Keyword -> Parser method for the expressions it starts
+PRIMARY_KEYWORDS = {
+    'take': Parser.parse_take,
+    'say':  Parser.parse_say,
+}
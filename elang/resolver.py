@@ -0,0 +1,84 @@
+
+# ============================================================
+#  Eusha Language - Resolver
+#  Assigns frame slots to function locals before execution.
+# ============================================================
+#
+#  Every name bound inside a function body (params, assignments, loop
+#  variables, nested `fn` and `use`) lives in that function's scope,
+#  so it gets a fixed index into the call frame. Reads of such names
+#  are annotated with (slot, depth); depth counts frames to hop for
+#  names that belong to an enclosing function. Top-level code and
+#  module scopes stay dict-based and are looked up by name.
+
+from nodes import *
+
+
+def resolve(ast):
+    """Annotate `ast` in place with frame slots for function locals."""
+    _resolve(ast, [])
+
+
+def _resolve(node, scopes):
+    t = type(node)
+    if t is FunctionDefNode or t is LambdaNode:
+        node.slots, node.num_slots = _function_slots(node.params, node.body)
+        _resolve(node.body, scopes + [node.slots])
+        return
+    if t is IdentifierNode:
+        node.slot, node.depth = _lookup(node.name, scopes)
+    elif t is FunctionCallNode:
+        node.is_global = _lookup(node.name, scopes)[0] is None
+    elif t is AssignNode or t is CompoundAssignNode:
+        if scopes:
+            node.slot = scopes[-1][node.name]
+    elif t is ForRangeNode or t is ForEachNode:
+        if scopes:
+            node.slot = scopes[-1][node.var]
+    for child in child_nodes(node):
+        _resolve(child, scopes)
+
+
+def _lookup(name, scopes):
+    depth = 0
+    for slots in reversed(scopes):
+        if name in slots:
+            return slots[name], depth
+        depth += 1
+    return None, 0
+
+
+def _function_slots(params, body):
+    """Map every name bound by a function to its frame index; returns
+    (slots, frame size).
+
+    Params take the first len(params) slots positionally (a repeated
+    param name keeps its last position, matching call-time binding).
+    """
+    slots = {}
+    for i, param in enumerate(params):
+        slots[param] = i
+    next_slot = len(params)
+    for name in _bound_names(body):
+        if name not in slots:
+            slots[name] = next_slot
+            next_slot += 1
+    return slots, next_slot
+
+
+def _bound_names(node):
+    """Yield names bound in the current scope, without entering nested functions."""
+    t = type(node)
+    if t is LambdaNode:
+        return
+    if t is AssignNode or t is CompoundAssignNode:
+        yield node.name
+    elif t is ForRangeNode or t is ForEachNode:
+        yield node.var
+    elif t is UseNode:
+        yield node.module_name
+    elif t is FunctionDefNode:
+        yield node.name
+        return
+    for child in child_nodes(node):
+        yield from _bound_names(child)
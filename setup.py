@@ -0,0 +1,44 @@
+"""Optional native build of the interpreter's hot modules.
+
+    pip install cython
+    python setup.py build_ext --inplace
+
+compiles elang/lexer.py and elang/parser.py, typed by the .pxd files
+next to them, into extension modules alongside. Python imports an
+extension module in preference to the .py file of the same name, so
+nothing else changes; without the build the plain Python sources are
+used.
+
+mypyc can build the same modules from their type hints alone:
+
+    pip install mypy
+    ELANG_BUILD=mypyc python setup.py build_ext --inplace
+"""
+
+import os
+from setuptools import setup, Extension
+
+MODULES = ['elang/lexer.py', 'elang/parser.py']
+
+package_dir = {}
+
+if os.environ.get('ELANG_BUILD') == 'mypyc':
+    from mypyc.build import mypycify
+    # elang.py puts elang/ on sys.path and imports `lexer`, not
+    # `elang.lexer`, so mypy has to name and resolve the modules the
+    # same way, and --inplace has to put top-level modules in elang/.
+    os.environ['MYPYPATH'] = 'elang'
+    ext_modules = mypycify(['--explicit-package-bases'] + MODULES)
+    package_dir = {'': 'elang'}
+else:
+    from Cython.Build import cythonize
+    ext_modules = cythonize(
+        [Extension(path[:-3].replace('/', '.'), [path]) for path in MODULES],
+        language_level=3,
+    )
+
+setup(
+    name='elang',
+    package_dir=package_dir,
+    ext_modules=ext_modules,
+)